@@ -18,10 +18,10 @@ CREATE TABLE IF NOT EXISTS video_analyses (
 );
 
 -- Индексы для оптимизации запросов
-CREATE INDEX IF NOT EXISTS idx_video_analyses_status ON video_analyses(status);
-CREATE INDEX IF NOT EXISTS idx_video_analyses_created_at ON video_analyses(created_at DESC);
-CREATE INDEX IF NOT EXISTS idx_video_analyses_motion_detected ON video_analyses(motion_detected);
 CREATE INDEX IF NOT EXISTS idx_video_analyses_filename ON video_analyses(filename);
+CREATE INDEX IF NOT EXISTS idx_video_analyses_status_created_at ON video_analyses(status, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_video_analyses_created_at_id ON video_analyses(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_video_analyses_motion_true ON video_analyses(id) WHERE motion_detected = true;
 
 -- Триггер для автоматического обновления updated_at
 CREATE OR REPLACE FUNCTION update_updated_at_column()
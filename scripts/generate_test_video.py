@@ -5,13 +5,438 @@
 """
 import cv2
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+import shutil
+import subprocess
 import sys
+import tempfile
 import os
 
 # Добавляем корневую директорию в PYTHONPATH
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+# ffmpeg опционален: без него используется cv2.VideoWriter
+FFMPEG_BINARY = shutil.which("ffmpeg")
+HAS_FFMPEG = FFMPEG_BINARY is not None
+
+# Размер буфера pipe для записи кадров в ffmpeg
+FFMPEG_PIPE_BUFFER_SIZE = 10 * 1024 * 1024
+
+# Количество кадров, которые рисуются в общий блок и записываются одним вызовом
+FRAMES_PER_BATCH = 16
+
+# Форматы кадров, которые принимают writer'ы
+PIXEL_FORMAT_I420 = "i420"
+PIXEL_FORMAT_BGR = "bgr"
+
+
+class FFmpegWriter:
+    """
+    Запись видео через процесс ffmpeg
+    
+    Кадры в формате I420 (YUV420p) передаются в stdin одного долгоживущего
+    процесса ffmpeg, который кодирует их в H.264 без конвертации цвета.
+    Интерфейс совместим с cv2.VideoWriter (write/release).
+    """
+    
+    PIXEL_FORMAT = PIXEL_FORMAT_I420
+    
+    def __init__(self, output_path: Path, fps: int, frame_size: tuple):
+        """
+        Запуск процесса ffmpeg
+        
+        Args:
+            output_path: Путь для сохранения видео
+            fps: Частота кадров
+            frame_size: Размер кадра (ширина, высота)
+        """
+        width, height = frame_size
+        command = [
+            FFMPEG_BINARY,
+            "-y",
+            "-loglevel", "error",
+            "-f", "rawvideo",
+            "-pix_fmt", "yuv420p",
+            "-s", f"{width}x{height}",
+            "-r", str(fps),
+            "-i", "-",
+            "-c:v", "libx264",
+            "-preset", "ultrafast",
+            "-pix_fmt", "yuv420p",
+            str(output_path),
+        ]
+        self.output_path = output_path
+        self._process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            bufsize=FFMPEG_PIPE_BUFFER_SIZE
+        )
+    
+    def write(self, frame: np.ndarray) -> None:
+        """
+        Запись кадра
+        
+        Args:
+            frame: Кадр в формате I420
+        """
+        # Передаем буфер массива напрямую, без промежуточной копии tobytes()
+        buffer = memoryview(np.ascontiguousarray(frame)).cast("B")
+        self._process.stdin.write(buffer)
+    
+    def write_frames(self, frames: np.ndarray) -> None:
+        """
+        Запись блока кадров одним вызовом
+        
+        Args:
+            frames: Кадры в формате I420, форма (N, height * 3 / 2, width)
+        """
+        self.write(frames)
+    
+    def release(self) -> None:
+        """
+        Завершение записи и ожидание окончания кодирования
+        
+        Raises:
+            RuntimeError: Если ffmpeg завершился с ошибкой
+        """
+        self._process.stdin.close()
+        return_code = self._process.wait()
+        
+        if return_code != 0:
+            raise RuntimeError(
+                f"ffmpeg exited with code {return_code} while writing {self.output_path}"
+            )
+
+
+class OpenCVWriter:
+    """
+    Запись видео через cv2.VideoWriter (если ffmpeg не установлен)
+    
+    Принимает кадры в формате BGR, которые cv2.VideoWriter кодирует без
+    дополнительной конвертации на стороне скрипта
+    """
+    
+    PIXEL_FORMAT = PIXEL_FORMAT_BGR
+    
+    def __init__(self, output_path: Path, fps: int, frame_size: tuple):
+        """
+        Инициализация cv2.VideoWriter
+        
+        Args:
+            output_path: Путь для сохранения видео
+            fps: Частота кадров
+            frame_size: Размер кадра (ширина, высота)
+        """
+        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+        self._writer = cv2.VideoWriter(str(output_path), fourcc, fps, frame_size)
+    
+    def write(self, frame: np.ndarray) -> None:
+        """
+        Запись кадра
+        
+        Args:
+            frame: Кадр в формате BGR
+        """
+        self._writer.write(frame)
+    
+    def write_frames(self, frames: np.ndarray) -> None:
+        """
+        Запись блока кадров
+        
+        Args:
+            frames: Кадры в формате BGR, форма (N, height, width, 3)
+        """
+        for frame in frames:
+            self.write(frame)
+    
+    def release(self) -> None:
+        """Завершение записи"""
+        self._writer.release()
+
+
+def _open_video_writer(output_path: Path, fps: int, width: int, height: int):
+    """
+    Создание объекта для записи видео
+    
+    Использует ffmpeg, если он установлен, иначе cv2.VideoWriter.
+    Формат принимаемых кадров задает атрибут PIXEL_FORMAT writer'а:
+    I420 для ffmpeg и BGR для cv2.VideoWriter.
+    
+    Args:
+        output_path: Путь для сохранения видео
+        fps: Частота кадров
+        width: Ширина кадра
+        height: Высота кадра
+        
+    Returns:
+        Объект с методами write(frame), write_frames(frames) и release()
+    """
+    if HAS_FFMPEG:
+        return FFmpegWriter(output_path, fps, (width, height))
+    
+    return OpenCVWriter(output_path, fps, (width, height))
+
+
+def _encode_still_video(image_path: Path, output_path: Path, fps: int, total_frames: int) -> None:
+    """
+    Кодирование видео из одного повторяющегося изображения через ffmpeg
+    
+    Args:
+        image_path: Путь к изображению
+        output_path: Путь для сохранения видео
+        fps: Частота кадров
+        total_frames: Количество кадров
+        
+    Raises:
+        subprocess.CalledProcessError: Если ffmpeg завершился с ошибкой
+    """
+    subprocess.run(
+        [
+            FFMPEG_BINARY,
+            "-y",
+            "-loglevel", "error",
+            "-loop", "1",
+            "-framerate", str(fps),
+            "-i", str(image_path),
+            "-frames:v", str(total_frames),
+            "-c:v", "libx264",
+            "-preset", "ultrafast",
+            "-tune", "stillimage",
+            "-pix_fmt", "yuv420p",
+            str(output_path),
+        ],
+        check=True
+    )
+
+
+def _convert_frame(frame: np.ndarray, pixel_format: str) -> np.ndarray:
+    """
+    Перевод кадра BGR в формат writer'а
+    
+    Args:
+        frame: Кадр в формате BGR
+        pixel_format: Формат кадров writer'а
+        
+    Returns:
+        np.ndarray: Кадр в формате pixel_format
+    """
+    if pixel_format == PIXEL_FORMAT_I420:
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2YUV_I420)
+    
+    return frame
+
+
+def _bgr_to_yuv(color: tuple) -> tuple:
+    """
+    Перевод цвета BGR в компоненты (Y, U, V) формата I420
+    
+    Args:
+        color: Цвет (BGR)
+        
+    Returns:
+        tuple: Значения (Y, U, V)
+    """
+    patch = np.full((2, 2, 3), color, dtype=np.uint8)
+    yuv = cv2.cvtColor(patch, cv2.COLOR_BGR2YUV_I420)
+    return int(yuv[0, 0]), int(yuv[2, 0]), int(yuv[2, 1])
+
+
+def _i420_planes(frame: np.ndarray) -> tuple:
+    """
+    Получение плоскостей Y, U, V кадра I420 (без копирования)
+    
+    Args:
+        frame: Кадр в формате I420, форма (height * 3 / 2, width)
+        
+    Returns:
+        tuple: Представления плоскостей (y, u, v)
+    """
+    height = frame.shape[0] * 2 // 3
+    width = frame.shape[1]
+    chroma_rows = height // 4
+    
+    y = frame[:height]
+    u = frame[height:height + chroma_rows].reshape(height // 2, width // 2)
+    v = frame[height + chroma_rows:].reshape(height // 2, width // 2)
+    return y, u, v
+
+
+def _draw_circle_i420(frame: np.ndarray, center: tuple, radius: int, color: tuple) -> None:
+    """
+    Рисование закрашенного круга в кадре I420
+    
+    Яркость рисуется в полном разрешении, цветность - в половинном
+    
+    Args:
+        frame: Кадр в формате I420
+        center: Центр круга (x, y)
+        radius: Радиус круга
+        color: Цвет (BGR)
+    """
+    y_plane, u_plane, v_plane = _i420_planes(frame)
+    y_value, u_value, v_value = _bgr_to_yuv(color)
+    chroma_center = (center[0] // 2, center[1] // 2)
+    
+    cv2.circle(y_plane, center, radius, y_value, -1)
+    cv2.circle(u_plane, chroma_center, radius // 2, u_value, -1)
+    cv2.circle(v_plane, chroma_center, radius // 2, v_value, -1)
+
+
+def _draw_circle(
+    frame: np.ndarray,
+    center: tuple,
+    radius: int,
+    color: tuple,
+    pixel_format: str
+) -> None:
+    """
+    Рисование закрашенного круга в кадре формата writer'а
+    
+    Args:
+        frame: Кадр в формате pixel_format
+        center: Центр круга (x, y)
+        radius: Радиус круга
+        color: Цвет (BGR)
+        pixel_format: Формат кадра
+    """
+    if pixel_format == PIXEL_FORMAT_I420:
+        _draw_circle_i420(frame, center, radius, color)
+    else:
+        cv2.circle(frame, center, radius, color, -1)
+
+
+def _text_plane(frame: np.ndarray, pixel_format: str) -> np.ndarray:
+    """
+    Изображение, в котором рисуется белый текст на сером фоне
+    
+    Args:
+        frame: Кадр в формате pixel_format
+        pixel_format: Формат кадра
+        
+    Returns:
+        np.ndarray: Плоскость Y для I420 или сам кадр для BGR
+    """
+    if pixel_format == PIXEL_FORMAT_I420:
+        return _i420_planes(frame)[0]
+    
+    return frame
+
+
+class DigitRenderer:
+    """
+    Отрисовка чисел по заранее подготовленным маскам цифр
+    
+    Маски цифр растеризуются шрифтом Hershey один раз, а в кадр
+    переносятся через NumPy вместо cv2.putText на каждом кадре
+    """
+    
+    FONT = cv2.FONT_HERSHEY_SIMPLEX
+    
+    def __init__(self, font_scale: float, thickness: int = 2, prefix: str = ""):
+        """
+        Подготовка масок цифр
+        
+        Args:
+            font_scale: Масштаб шрифта
+            thickness: Толщина линий
+            prefix: Текст перед числом (рисуется отдельно, например в фоне)
+        """
+        (prefix_width, _), _ = cv2.getTextSize(prefix, self.FONT, font_scale, thickness)
+        (digit_width, digit_height), baseline = cv2.getTextSize(
+            "0", self.FONT, font_scale, thickness
+        )
+        self._pad = thickness
+        self._ascent = digit_height
+        self.advance = digit_width - thickness
+        
+        # cv2.putText двигает перо с субпиксельной точностью, и после префикса
+        # цифра начинается с дробной координаты. Поэтому маска цифры - это
+        # разница отрисовки префикса с цифрой и одного префикса: так она
+        # совпадает с putText для всей строки попиксельно
+        tile_shape = (
+            digit_height + baseline + 2 * thickness,
+            prefix_width + digit_width + 2 * thickness
+        )
+        text_org = (thickness, thickness + digit_height)
+        prefix_tile = np.zeros(tile_shape, dtype=np.uint8)
+        cv2.putText(prefix_tile, prefix, text_org, self.FONT, font_scale, 255, thickness)
+        
+        masks = {}
+        for digit in "0123456789":
+            tile = np.zeros(tile_shape, dtype=np.uint8)
+            cv2.putText(
+                tile,
+                prefix + digit,
+                text_org,
+                self.FONT,
+                font_scale,
+                255,
+                thickness
+            )
+            masks[digit] = (tile > 0) & (prefix_tile == 0)
+        
+        # Маски обрезаются по столбцам, занятым хотя бы одной цифрой
+        columns = np.flatnonzero(np.any(np.stack(list(masks.values())), axis=(0, 1)))
+        self._left = int(columns[0]) - thickness
+        self._masks = {
+            digit: mask[:, columns[0]:columns[-1] + 1] for digit, mask in masks.items()
+        }
+    
+    def draw(self, plane: np.ndarray, number: int, org: tuple, value: int) -> None:
+        """
+        Отрисовка числа в одноканальном изображении
+        
+        Args:
+            plane: Изображение (плоскость Y кадра I420 или кадр BGR)
+            number: Неотрицательное число
+            org: Левая нижняя точка всей строки с префиксом (как в cv2.putText)
+            value: Значение пикселей текста (яркость или цвет BGR)
+        """
+        x, y = org
+        top = y - self._ascent - self._pad
+        left = x + self._left
+        
+        for digit in str(number):
+            mask = self._masks[digit]
+            plane[top:top + mask.shape[0], left:left + mask.shape[1]][mask] = value
+            left += self.advance
+
+
+def _make_labeled_background(
+    width: int,
+    height: int,
+    color: tuple,
+    text: str,
+    font_scale: float,
+    pixel_format: str
+) -> np.ndarray:
+    """
+    Создание кадра-фона с заранее нарисованной надписью
+    
+    Args:
+        width: Ширина кадра
+        height: Высота кадра
+        color: Цвет фона (BGR)
+        text: Текст надписи
+        font_scale: Масштаб шрифта
+        pixel_format: Формат кадров writer'а
+        
+    Returns:
+        np.ndarray: Кадр фона в формате pixel_format
+    """
+    frame = np.full((height, width, 3), color, dtype=np.uint8)
+    cv2.putText(
+        frame,
+        text,
+        (10, 30),
+        cv2.FONT_HERSHEY_SIMPLEX,
+        font_scale,
+        (255, 255, 255),
+        2
+    )
+    return _convert_frame(frame, pixel_format)
+
 
 def generate_static_video(output_path: Path, duration_seconds: int = 3, fps: int = 30):
     """
@@ -23,8 +448,6 @@ def generate_static_video(output_path: Path, duration_seconds: int = 3, fps: int
         fps: Частота кадров
     """
     width, height = 640, 480
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    out = cv2.VideoWriter(str(output_path), fourcc, fps, (width, height))
     
     # Создаем статичный кадр
     frame = np.zeros((height, width, 3), dtype=np.uint8)
@@ -41,12 +464,22 @@ def generate_static_video(output_path: Path, duration_seconds: int = 3, fps: int
         2
     )
     
-    # Записываем одинаковые кадры
     total_frames = duration_seconds * fps
-    for _ in range(total_frames):
-        out.write(frame)
     
-    out.release()
+    if HAS_FFMPEG:
+        # Кадр кодируется один раз и повторяется средствами ffmpeg
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            image_path = Path(tmp_dir) / "frame.png"
+            cv2.imwrite(str(image_path), frame)
+            _encode_still_video(image_path, output_path, fps, total_frames)
+    else:
+        # Записываем одинаковые кадры
+        out = _open_video_writer(output_path, fps, width, height)
+        frame = _convert_frame(frame, out.PIXEL_FORMAT)
+        for _ in range(total_frames):
+            out.write(frame)
+        out.release()
+    
     print(f"✓ Static video created: {output_path}")
 
 
@@ -60,35 +493,66 @@ def generate_motion_video(output_path: Path, duration_seconds: int = 3, fps: int
         fps: Частота кадров
     """
     width, height = 640, 480
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    out = cv2.VideoWriter(str(output_path), fourcc, fps, (width, height))
+    out = _open_video_writer(output_path, fps, width, height)
+    pixel_format = out.PIXEL_FORMAT
     
     total_frames = duration_seconds * fps
     
-    for frame_num in range(total_frames):
-        # Создаем кадр
-        frame = np.zeros((height, width, 3), dtype=np.uint8)
-        frame[:] = (50, 50, 50)  # Темный фон
-        
-        # Движущийся объект (круг)
-        x = int((frame_num / total_frames) * width)
-        y = height // 2
-        radius = 30
-        
-        cv2.circle(frame, (x, y), radius, (0, 255, 0), -1)
-        
-        # Текст
-        cv2.putText(
-            frame,
-            f"Motion Video - Frame {frame_num}",
-            (10, 30),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            0.7,
-            (255, 255, 255),
-            2
-        )
+    # Фон рисуем один раз, в цикле только копируем его в переиспользуемый буфер
+    base = _convert_frame(
+        np.full((height, width, 3), (50, 50, 50), dtype=np.uint8),  # Темный фон
+        pixel_format
+    )
+    
+    # Белый текст на сером фоне не меняет цветность, поэтому в I420
+    # надпись достаточно рисовать только в плоскости яркости.
+    # Неизменная часть надписи рисуется в фоне один раз
+    if pixel_format == PIXEL_FORMAT_I420:
+        text_value = _bgr_to_yuv((255, 255, 255))[0]
+    else:
+        text_value = (255, 255, 255)
+    label_prefix = "Motion Video - Frame "
+    label_org = (10, 30)
+    label_scale = 0.7
+    label_thickness = 2
+    cv2.putText(
+        _text_plane(base, pixel_format),
+        label_prefix,
+        label_org,
+        DigitRenderer.FONT,
+        label_scale,
+        text_value,
+        label_thickness
+    )
+    
+    # Номер кадра собирается из заранее отрисованных цифр, маски
+    # которых учитывают положение пера после префикса
+    digits = DigitRenderer(
+        font_scale=label_scale, thickness=label_thickness, prefix=label_prefix
+    )
+    
+    # Кадры рисуются блоками: фон копируется в весь блок одной операцией,
+    # а блок целиком передается в writer одним вызовом
+    batch = np.empty((FRAMES_PER_BATCH,) + base.shape, dtype=np.uint8)
+    
+    # Траектория движущегося объекта (круга) вычисляется сразу для всех кадров
+    xs = np.arange(total_frames) * width // total_frames
+    y = height // 2
+    radius = 30
+    
+    for batch_start in range(0, total_frames, FRAMES_PER_BATCH):
+        frames = batch[:min(FRAMES_PER_BATCH, total_frames - batch_start)]
+        frames[:] = base
         
-        out.write(frame)
+        for offset, frame in enumerate(frames):
+            frame_num = batch_start + offset
+            
+            _draw_circle(frame, (int(xs[frame_num]), y), radius, (0, 255, 0), pixel_format)
+            
+            # Номер кадра
+            digits.draw(_text_plane(frame, pixel_format), frame_num, label_org, text_value)
+        
+        out.write_frames(frames)
     
     out.release()
     print(f"✓ Motion video created: {output_path}")
@@ -104,36 +568,36 @@ def generate_partial_motion_video(output_path: Path, duration_seconds: int = 6,
         fps: Частота кадров
     """
     width, height = 640, 480
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    out = cv2.VideoWriter(str(output_path), fourcc, fps, (width, height))
+    out = _open_video_writer(output_path, fps, width, height)
     
     total_frames = duration_seconds * fps
     motion_start = total_frames // 3  # Движение начинается с 1/3
     motion_end = 2 * total_frames // 3  # Заканчивается на 2/3
     
+    # Надписи не пересекаются с кругом, поэтому оба варианта фона
+    # (с надписью "Motion Active" и "Static Phase") рисуются заранее
+    pixel_format = out.PIXEL_FORMAT
+    motion_base = _make_labeled_background(
+        width, height, (70, 70, 70), "Motion Active", 0.8, pixel_format
+    )
+    static_base = _make_labeled_background(
+        width, height, (70, 70, 70), "Static Phase", 0.8, pixel_format
+    )
+    frame = np.empty_like(motion_base)
+    
+    # Траектория круга на интервале движения
+    motion_frames = motion_end - motion_start
+    xs = np.arange(motion_frames) * width // motion_frames
+    y = height // 2
+    
     for frame_num in range(total_frames):
-        frame = np.zeros((height, width, 3), dtype=np.uint8)
-        frame[:] = (70, 70, 70)
-        
         # Движение только в определенном интервале
         if motion_start <= frame_num < motion_end:
-            progress = (frame_num - motion_start) / (motion_end - motion_start)
-            x = int(progress * width)
-            y = height // 2
-            cv2.circle(frame, (x, y), 25, (255, 0, 0), -1)
-            text = "Motion Active"
+            np.copyto(frame, motion_base)
+            x = int(xs[frame_num - motion_start])
+            _draw_circle(frame, (x, y), 25, (255, 0, 0), pixel_format)
         else:
-            text = "Static Phase"
-        
-        cv2.putText(
-            frame,
-            text,
-            (10, 30),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            0.8,
-            (255, 255, 255),
-            2
-        )
+            np.copyto(frame, static_base)
         
         out.write(frame)
     
@@ -151,10 +615,17 @@ def main():
     print(f"Output directory: {fixtures_dir}")
     print()
     
-    # Генерация тестовых видео
-    generate_static_video(fixtures_dir / "static_video.mp4")
-    generate_motion_video(fixtures_dir / "motion_video.mp4")
-    generate_partial_motion_video(fixtures_dir / "partial_motion_video.mp4")
+    # Генерация тестовых видео: задачи независимы, поэтому кодируются параллельно
+    jobs = [
+        (generate_static_video, fixtures_dir / "static_video.mp4"),
+        (generate_motion_video, fixtures_dir / "motion_video.mp4"),
+        (generate_partial_motion_video, fixtures_dir / "partial_motion_video.mp4"),
+    ]
+    
+    with ProcessPoolExecutor(max_workers=len(jobs)) as executor:
+        futures = [executor.submit(generator, path) for generator, path in jobs]
+        for future in futures:
+            future.result()
     
     print()
     print("✓ All test videos generated successfully!")
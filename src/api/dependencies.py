@@ -1,11 +1,14 @@
 """
 FastAPI dependencies
 """
+from functools import lru_cache
+
 from fastapi import Depends
 from sqlalchemy.orm import Session
 
 from src.db.database import get_db
 from src.db.repository import VideoAnalysisRepository
+from src.services.video_analyzer import VideoAnalyzer
 
 
 def get_repository(db: Session = Depends(get_db)) -> VideoAnalysisRepository:
@@ -20,3 +23,16 @@ def get_repository(db: Session = Depends(get_db)) -> VideoAnalysisRepository:
     """
     return VideoAnalysisRepository(db)
 
+
+@lru_cache(maxsize=1)
+def get_analyzer() -> VideoAnalyzer:
+    """
+    Dependency для получения анализатора видео
+    
+    Анализатор не хранит состояние между вызовами analyze(),
+    поэтому один экземпляр переиспользуется всеми запросами
+    
+    Returns:
+        VideoAnalyzer: Analyzer instance
+    """
+    return VideoAnalyzer()
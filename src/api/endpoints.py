@@ -2,16 +2,22 @@
 API endpoints для VisionGuard
 """
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import Response
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 from pathlib import Path
+from datetime import datetime
+from typing import Optional
 import logging
 
 from src.api.models import (
     VideoAnalysisResponse,
+    AnalysisCursor,
     AnalysisListResponse,
     ErrorResponse
 )
+from src.api.dependencies import get_analyzer
 from src.db.database import get_db
 from src.db.repository import VideoAnalysisRepository
 from src.services.video_analyzer import VideoAnalyzer
@@ -30,6 +36,9 @@ logger = logging.getLogger(__name__)
 # Создание роутера
 router = APIRouter(tags=["video-analysis"])
 
+# Пакетная валидация списка ORM объектов (создается один раз)
+_analysis_list_adapter = TypeAdapter(list[VideoAnalysisResponse])
+
 
 @router.post(
     "/analyze",
@@ -47,7 +56,8 @@ router = APIRouter(tags=["video-analysis"])
 )
 async def analyze_video(
     file: UploadFile = File(..., description="Видеофайл для анализа"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    analyzer: VideoAnalyzer = Depends(get_analyzer)
 ) -> VideoAnalysisResponse:
     """
     Анализ видеофайла на наличие движения
@@ -60,9 +70,13 @@ async def analyze_video(
     5. Обновление метрик Prometheus
     6. Очистка временных файлов
     
+    Блокирующие шаги (работа с файлами, анализ, запись в БД) выполняются
+    в пуле потоков, чтобы не блокировать event loop
+    
     Args:
         file: Загруженный видеофайл
         db: Database session
+        analyzer: Анализатор видео
         
     Returns:
         VideoAnalysisResponse: Результаты анализа
@@ -75,13 +89,12 @@ async def analyze_video(
     try:
         logger.info(f"Received video for analysis: {file.filename}")
         
-        # 1. Сохранение файла
-        video_path = save_upload_file(file.file, file.filename)
-        logger.info(f"Video saved to: {video_path}")
-        
-        # 2. Валидация
+        # 1-2. Сохранение и валидация (сохранение прерывается на превышении размера)
         try:
-            validate_video_file(video_path)
+            video_path = await run_in_threadpool(save_upload_file, file.file, file.filename)
+            logger.info(f"Video saved to: {video_path}")
+            
+            await run_in_threadpool(validate_video_file, video_path)
         except VideoTooLargeError as e:
             logger.warning(f"Video too large: {e}")
             metrics_collector.record_processing_error("VideoTooLargeError")
@@ -122,9 +135,8 @@ async def analyze_video(
             )
         
         # 3. Анализ видео
-        analyzer = VideoAnalyzer()
         try:
-            result = analyzer.analyze(video_path)
+            result = await run_in_threadpool(analyzer.analyze, video_path)
             logger.info(f"Analysis completed: motion={result.motion_detected}")
         except VideoProcessingError as e:
             logger.error(f"Processing error: {e}")
@@ -139,7 +151,8 @@ async def analyze_video(
         
         # 4. Сохранение в БД
         repo = VideoAnalysisRepository(db)
-        analysis = repo.create(
+        analysis = await run_in_threadpool(
+            repo.create,
             filename=file.filename,
             motion_detected=result.motion_detected,
             frames_analyzed=result.frames_analyzed,
@@ -148,25 +161,12 @@ async def analyze_video(
         )
         
         # 5. Обновление метрик
-        metrics_collector.record_video_processed()
-        metrics_collector.update_processing_time(result.processing_time)
-        
-        if result.motion_detected:
-            metrics_collector.record_motion_detected()
+        metrics_collector.record_result(result.processing_time, result.motion_detected)
         
         logger.info(f"Analysis saved with ID: {analysis.id}")
         
         # 6. Возврат результата
-        return VideoAnalysisResponse(
-            id=analysis.id,
-            filename=analysis.filename,
-            motion_detected=analysis.motion_detected,
-            frames_analyzed=analysis.frames_analyzed,
-            processing_time=analysis.processing_time,
-            status=analysis.status,
-            error_message=analysis.error_message,
-            created_at=analysis.created_at
-        )
+        return VideoAnalysisResponse.model_validate(analysis)
         
     except HTTPException:
         raise
@@ -183,53 +183,76 @@ async def analyze_video(
     finally:
         # Очистка временных файлов
         if video_path:
-            cleanup_file(video_path)
+            await run_in_threadpool(cleanup_file, video_path)
 
 
 @router.get(
     "/analyses",
     response_model=AnalysisListResponse,
     summary="Получить список всех анализов",
-    description="Возвращает список всех проведенных анализов с пагинацией"
+    description="Возвращает список всех проведенных анализов с пагинацией",
+    responses={
+        422: {"model": ErrorResponse, "description": "Некорректный курсор"}
+    }
 )
 async def get_analyses(
     skip: int = 0,
     limit: int = 100,
     status_filter: str = None,
+    after_created_at: Optional[datetime] = None,
+    after_id: Optional[int] = None,
     db: Session = Depends(get_db)
 ) -> AnalysisListResponse:
     """
     Получение списка анализов с пагинацией
     
+    Для перехода на следующую страницу передайте значения next_cursor
+    из предыдущего ответа в after_created_at и after_id. В отличие от
+    skip, время ответа не растет с номером страницы
+    
+    Без status_filter для больших таблиц total - оценка по статистике
+    PostgreSQL (estimated=True); с фильтром total всегда точный
+    
     Args:
         skip: Количество пропускаемых записей
         limit: Максимальное количество записей
         status_filter: Фильтр по статусу
+        after_created_at: Дата создания из курсора предыдущей страницы
+        after_id: ID из курсора предыдущей страницы
         db: Database session
         
     Returns:
         AnalysisListResponse: Список анализов
+        
+    Raises:
+        HTTPException: Если передана только одна часть курсора
     """
+    if (after_created_at is None) != (after_id is None):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={
+                "error": "InvalidCursor",
+                "message": "after_created_at and after_id must be provided together"
+            }
+        )
+    
+    after = (after_created_at, after_id) if after_id is not None else None
+    
     repo = VideoAnalysisRepository(db)
     
-    items = repo.get_all(skip=skip, limit=limit, status=status_filter)
-    total = repo.count_total()
+    items = repo.get_all(skip=skip, limit=limit, status=status_filter, after=after)
+    total, estimated = repo.count_total_estimated(status=status_filter)
+    
+    next_cursor = None
+    if items and len(items) == limit:
+        last = items[-1]
+        next_cursor = AnalysisCursor(created_at=last.created_at, id=last.id)
     
     return AnalysisListResponse(
         total=total,
-        items=[
-            VideoAnalysisResponse(
-                id=item.id,
-                filename=item.filename,
-                motion_detected=item.motion_detected,
-                frames_analyzed=item.frames_analyzed,
-                processing_time=item.processing_time,
-                status=item.status,
-                error_message=item.error_message,
-                created_at=item.created_at
-            )
-            for item in items
-        ]
+        estimated=estimated,
+        items=_analysis_list_adapter.validate_python(items, from_attributes=True),
+        next_cursor=next_cursor
     )
 
 
@@ -271,16 +294,7 @@ async def get_analysis(
             }
         )
     
-    return VideoAnalysisResponse(
-        id=analysis.id,
-        filename=analysis.filename,
-        motion_detected=analysis.motion_detected,
-        frames_analyzed=analysis.frames_analyzed,
-        processing_time=analysis.processing_time,
-        status=analysis.status,
-        error_message=analysis.error_message,
-        created_at=analysis.created_at
-    )
+    return VideoAnalysisResponse.model_validate(analysis)
 
 
 @router.get(
@@ -60,16 +60,39 @@ class VideoAnalysisDetailedResponse(VideoAnalysisResponse):
         }
 
 
+class AnalysisCursor(BaseModel):
+    """Курсор для постраничного получения списка анализов"""
+    
+    created_at: datetime = Field(..., description="Дата создания последней записи страницы")
+    id: int = Field(..., description="ID последней записи страницы")
+
+
 class AnalysisListResponse(BaseModel):
     """Ответ со списком анализов"""
     
-    total: int = Field(..., description="Общее количество записей")
+    total: int = Field(
+        ...,
+        description=(
+            "Общее количество записей. Без status_filter для больших таблиц "
+            "(от ESTIMATED_COUNT_THRESHOLD строк) - оценка по статистике "
+            "PostgreSQL, см. estimated"
+        )
+    )
+    estimated: bool = Field(
+        False,
+        description="True, если total - приблизительная оценка, а не точный подсчет"
+    )
     items: list[VideoAnalysisResponse] = Field(..., description="Список анализов")
+    next_cursor: Optional[AnalysisCursor] = Field(
+        None,
+        description="Курсор следующей страницы (None, если страница последняя)"
+    )
     
     class Config:
         json_schema_extra = {
             "example": {
                 "total": 42,
+                "estimated": False,
                 "items": [
                     {
                         "id": 1,
@@ -80,7 +103,11 @@ class AnalysisListResponse(BaseModel):
                         "status": "completed",
                         "created_at": "2025-11-12T10:30:00"
                     }
-                ]
+                ],
+                "next_cursor": {
+                    "created_at": "2025-11-12T10:30:00",
+                    "id": 1
+                }
             }
         }
 
@@ -14,6 +14,19 @@ class Settings(BaseSettings):
     POSTGRES_DB: str = "visionguard_db"
     POSTGRES_HOST: str = "db"
     POSTGRES_PORT: int = 5432
+    # Проверка соединения (SELECT 1) при каждой выдаче из пула.
+    # По умолчанию выключена: доступность БД регулярно проверяет /health,
+    # а при обрыве соединения SQLAlchemy сам сбрасывает пул
+    DB_POOL_PRE_PING: bool = False
+    # Пул соединений: постоянные соединения, дополнительные при пиковой
+    # нагрузке, ожидание свободного соединения (сек) и время жизни (сек)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    # Начиная с этого размера таблицы общее количество записей в списке
+    # анализов берется из статистики PostgreSQL вместо полного count(*)
+    ESTIMATED_COUNT_THRESHOLD: int = 100_000
     
     @property
     def DATABASE_URL(self) -> str:
@@ -33,9 +46,29 @@ class Settings(BaseSettings):
     # Video Processing
     MAX_VIDEO_SIZE_MB: int = 100
     FRAME_SAMPLE_RATE: int = 5
-    MOTION_THRESHOLD: float = 0.02
+    # Доля пикселей кадра, изменившихся сильнее порога яркости.
+    # Маска изменений не дилатируется, поэтому значение откалибровано
+    # ниже прежних 0.02 (дилатация 5x5 увеличивала долю ~в 1.5 раза)
+    MOTION_THRESHOLD: float = 0.013
     PROCESSING_WIDTH: int = 640
     PROCESSING_HEIGHT: int = 480
+    # Аппаратное декодирование видео (NVDEC/VAAPI/D3D11), если доступно
+    VIDEO_HW_ACCELERATION: bool = True
+    # Анализ длинных видео по сегментам в нескольких процессах
+    # (1 - отключено). Сегментирование включается начиная с
+    # PARALLEL_ANALYSIS_MIN_FRAMES кадров: для коротких видео запуск
+    # процессов дороже самого анализа
+    ANALYSIS_WORKERS: int = 1
+    PARALLEL_ANALYSIS_MIN_FRAMES: int = 9000
+    
+    # Прекращать анализ, как только движение гарантированно обнаружено.
+    # Вывод motion_detected не меняется, но frames_analyzed и
+    # motion_percentage считаются только по прочитанной части видео
+    MOTION_EARLY_EXIT: bool = False
+    
+    # Дополнительная проверка MIME типа через libmagic (python-magic)
+    # после проверки сигнатуры контейнера
+    VIDEO_DEEP_MIME_CHECK: bool = False
     
     # File Upload
     UPLOAD_DIR: str = "/tmp/visionguard_uploads"
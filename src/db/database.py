@@ -1,7 +1,7 @@
 """
 Настройка подключения к базе данных
 """
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from typing import Generator
@@ -14,14 +14,22 @@ logger = logging.getLogger(__name__)
 # Создание engine для подключения к PostgreSQL
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_size=10,           # Размер пула соединений
-    max_overflow=20,        # Максимальное количество дополнительных соединений
-    pool_timeout=30,        # Timeout ожидания свободного соединения
-    pool_recycle=3600,      # Переиспользование соединения через час
-    pool_pre_ping=True,     # Проверка соединения перед использованием
+    pool_size=settings.DB_POOL_SIZE,          # Размер пула соединений
+    max_overflow=settings.DB_MAX_OVERFLOW,    # Максимальное количество дополнительных соединений
+    pool_timeout=settings.DB_POOL_TIMEOUT,    # Timeout ожидания свободного соединения
+    pool_recycle=settings.DB_POOL_RECYCLE,    # Переоткрытие соединения по истечении времени жизни
+    pool_pre_ping=settings.DB_POOL_PRE_PING,  # Проверка соединения перед использованием
+    pool_use_lifo=True,     # Переиспользование последних ("теплых") соединений
     echo=settings.DEBUG,    # Логирование SQL запросов в debug режиме
+    connect_args={
+        # JIT PostgreSQL не окупается на коротких запросах репозитория
+        "options": "-c jit=off",
+    },
 )
 
+# Запрос для проверки подключения (создается один раз)
+_PING_STATEMENT = text("SELECT 1")
+
 # Session factory
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -89,7 +97,7 @@ def check_db_connection() -> bool:
     """
     try:
         with engine.connect() as conn:
-            conn.execute("SELECT 1")
+            conn.execute(_PING_STATEMENT)
         logger.info("Database connection check: OK")
         return True
     except Exception as e:
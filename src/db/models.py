@@ -1,7 +1,7 @@
 """
 SQLAlchemy ORM модели для базы данных
 """
-from sqlalchemy import Column, Integer, String, Boolean, Float, Text, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, Float, Text, DateTime, Index
 from sqlalchemy.sql import func
 from datetime import datetime
 
@@ -28,14 +28,27 @@ class VideoAnalysis(Base):
     
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     filename = Column(String(255), nullable=False, index=True)
-    motion_detected = Column(Boolean, nullable=False, index=True)
+    motion_detected = Column(Boolean, nullable=False)
     frames_analyzed = Column(Integer, nullable=False)
     processing_time = Column(Float, nullable=False)
-    status = Column(String(50), nullable=False, index=True, default="pending")
+    status = Column(String(50), nullable=False, default="pending")
     error_message = Column(Text, nullable=True)
     created_at = Column(DateTime, nullable=False, default=func.now(), server_default=func.now())
     updated_at = Column(DateTime, nullable=False, default=func.now(), onupdate=func.now())
     
+    __table_args__ = (
+        # Список анализов: фильтр по статусу + сортировка по дате создания
+        Index("idx_video_analyses_status_created_at", status, created_at.desc()),
+        # Keyset пагинация списка анализов по курсору (created_at, id)
+        Index("idx_video_analyses_created_at_id", created_at.desc(), id.desc()),
+        # Подсчет видео с движением: частичный индекс только по нужным строкам
+        Index(
+            "idx_video_analyses_motion_true",
+            id,
+            postgresql_where=motion_detected == True
+        ),
+    )
+    
     def __repr__(self) -> str:
         """Строковое представление модели"""
         return (
@@ -49,6 +62,9 @@ class VideoAnalysis(Base):
         """
         Преобразование модели в словарь
         
+        Даты возвращаются как datetime: ответы API сериализуются через
+        orjson, который кодирует datetime в ISO 8601 сам
+        
         Returns:
             dict: Словарь с данными модели
         """
@@ -60,7 +76,7 @@ class VideoAnalysis(Base):
             "processing_time": self.processing_time,
             "status": self.status,
             "error_message": self.error_message,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
         }
 
@@ -1,15 +1,25 @@
 """
 Repository паттерн для работы с базой данных
 """
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import delete, desc, func, insert, inspect, select, text, tuple_, update
 import logging
 
+from src.config import settings
 from src.db.models import VideoAnalysis
 
 logger = logging.getLogger(__name__)
 
+# Оценка количества строк таблицы по статистике планировщика (O(1)).
+# Таблица ищется через to_regclass с учетом search_path, а не по relname,
+# который не уникален между схемами
+_ESTIMATED_COUNT_STATEMENT = text(
+    "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)"
+)
+
 
 class VideoAnalysisRepository:
     """
@@ -70,6 +80,37 @@ class VideoAnalysisRepository:
             logger.error(f"Error creating video analysis: {e}")
             raise
     
+    def create_many(self, records: List[Dict[str, Any]]) -> List[int]:
+        """
+        Пакетное создание записей анализа видео
+        
+        Все записи вставляются одним INSERT ... RETURNING (SQLAlchemy
+        разбивает его на пакеты insertmanyvalues) вместо INSERT + SELECT
+        на каждую запись, как в create
+        
+        Args:
+            records: Словари с полями записей (как аргументы create)
+            
+        Returns:
+            List[int]: ID созданных записей в порядке records
+        """
+        if not records:
+            return []
+        
+        stmt = insert(VideoAnalysis).returning(
+            VideoAnalysis.id, sort_by_parameter_order=True
+        )
+        
+        try:
+            ids = list(self.db.scalars(stmt, records).all())
+            self.db.commit()
+            logger.info(f"Created {len(ids)} video analysis records")
+            return ids
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error creating video analyses: {e}")
+            raise
+    
     def get_by_id(self, analysis_id: int) -> Optional[VideoAnalysis]:
         """
         Получение записи по ID
@@ -86,15 +127,22 @@ class VideoAnalysisRepository:
         self,
         skip: int = 0,
         limit: int = 100,
-        status: Optional[str] = None
+        status: Optional[str] = None,
+        after: Optional[Tuple[datetime, int]] = None
     ) -> List[VideoAnalysis]:
         """
         Получение списка всех записей с пагинацией
         
+        Записи отсортированы по (created_at, id) по убыванию. Для глубоких
+        страниц следует передавать курсор after вместо skip: OFFSET
+        заставляет БД прочитать и отбросить все пропускаемые строки
+        
         Args:
             skip: Количество пропускаемых записей
             limit: Максимальное количество записей
             status: Фильтр по статусу (опционально)
+            after: Курсор (created_at, id) последней записи предыдущей
+                страницы (опционально)
             
         Returns:
             List[VideoAnalysis]: Список записей
@@ -104,7 +152,17 @@ class VideoAnalysisRepository:
         if status:
             query = query.filter(VideoAnalysis.status == status)
         
-        return query.order_by(desc(VideoAnalysis.created_at)).offset(skip).limit(limit).all()
+        if after is not None:
+            query = query.filter(
+                tuple_(VideoAnalysis.created_at, VideoAnalysis.id) < tuple_(*after)
+            )
+        
+        query = query.order_by(desc(VideoAnalysis.created_at), desc(VideoAnalysis.id))
+        
+        if skip:
+            query = query.offset(skip)
+        
+        return query.limit(limit).all()
     
     def get_by_filename(self, filename: str) -> List[VideoAnalysis]:
         """
@@ -140,25 +198,46 @@ class VideoAnalysisRepository:
         Returns:
             Optional[VideoAnalysis]: Обновленная запись или None
         """
-        analysis = self.get_by_id(analysis_id)
+        values = {"status": status}
+        if error_message:
+            values["error_message"] = error_message
         
-        if not analysis:
-            logger.warning(f"Video analysis not found: id={analysis_id}")
-            return None
+        # Одно UPDATE ... RETURNING вместо SELECT + UPDATE + SELECT (refresh)
+        stmt = (
+            update(VideoAnalysis)
+            .where(VideoAnalysis.id == analysis_id)
+            .values(**values)
+            .returning(VideoAnalysis)
+        )
         
         try:
-            analysis.status = status
-            if error_message:
-                analysis.error_message = error_message
+            analysis = self.db.execute(stmt).scalar_one_or_none()
+            
+            # commit() помечает атрибуты устаревшими, и первое обращение к
+            # ним вызвало бы SELECT. Значения из RETURNING запоминаются до
+            # commit и восстанавливаются как загруженные из БД
+            loaded_values = {}
+            if analysis is not None:
+                loaded_values = {
+                    column.key: getattr(analysis, column.key)
+                    for column in inspect(VideoAnalysis).column_attrs
+                }
             
             self.db.commit()
-            self.db.refresh(analysis)
-            logger.info(f"Updated video analysis status: id={analysis_id}, status={status}")
-            return analysis
         except Exception as e:
             self.db.rollback()
             logger.error(f"Error updating video analysis: {e}")
             raise
+        
+        if not analysis:
+            logger.warning(f"Video analysis not found: id={analysis_id}")
+            return None
+        
+        for key, value in loaded_values.items():
+            set_committed_value(analysis, key, value)
+        
+        logger.info(f"Updated video analysis status: id={analysis_id}, status={status}")
+        return analysis
     
     def delete(self, analysis_id: int) -> bool:
         """
@@ -170,30 +249,80 @@ class VideoAnalysisRepository:
         Returns:
             bool: True если удалено, False если не найдено
         """
-        analysis = self.get_by_id(analysis_id)
-        
-        if not analysis:
-            return False
+        stmt = (
+            delete(VideoAnalysis)
+            .where(VideoAnalysis.id == analysis_id)
+            .returning(VideoAnalysis.id)
+        )
         
         try:
-            self.db.delete(analysis)
+            deleted_id = self.db.execute(stmt).scalar_one_or_none()
             self.db.commit()
-            logger.info(f"Deleted video analysis: id={analysis_id}")
-            return True
         except Exception as e:
             self.db.rollback()
             logger.error(f"Error deleting video analysis: {e}")
             raise
+        
+        if deleted_id is None:
+            return False
+        
+        logger.info(f"Deleted video analysis: id={analysis_id}")
+        return True
     
-    def count_total(self) -> int:
+    def count_total(self, status: Optional[str] = None) -> int:
         """
         Подсчет общего количества записей
         
+        Args:
+            status: Фильтр по статусу (опционально)
+            
         Returns:
             int: Количество записей
         """
+        if status:
+            return self.count_by_status(status)
+        
         return self.db.query(VideoAnalysis).count()
     
+    def count_total_estimated(self, status: Optional[str] = None) -> Tuple[int, bool]:
+        """
+        Подсчет общего количества записей с признаком оценки
+        
+        Используется для списка анализов, где точное значение не требуется.
+        Оценка по статистике PostgreSQL используется только без фильтра
+        и только начиная с settings.ESTIMATED_COUNT_THRESHOLD строк: статистика
+        относится ко всей таблице, поэтому с фильтром по статусу всегда
+        выполняется точный подсчет
+        
+        Args:
+            status: Фильтр по статусу (опционально)
+            
+        Returns:
+            tuple: (количество записей, True если это оценка)
+        """
+        if not status:
+            estimated = self._estimate_total()
+            
+            if estimated is not None and estimated >= settings.ESTIMATED_COUNT_THRESHOLD:
+                return estimated, True
+        
+        return self.count_total(status), False
+    
+    def _estimate_total(self) -> Optional[int]:
+        """
+        Оценка количества записей по статистике PostgreSQL
+        
+        Returns:
+            Optional[int]: Оценка или None, если БД не PostgreSQL
+        """
+        if self.db.get_bind().dialect.name != "postgresql":
+            return None
+        
+        return self.db.execute(
+            _ESTIMATED_COUNT_STATEMENT,
+            {"table_name": VideoAnalysis.__tablename__}
+        ).scalar()
+    
     def count_by_status(self, status: str) -> int:
         """
         Подсчет записей по статусу
@@ -218,4 +347,30 @@ class VideoAnalysisRepository:
             .filter(VideoAnalysis.motion_detected == True)
             .count()
         )
-
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Сводная статистика по всем записям одним запросом
+        
+        Один проход по таблице с группировкой по статусу вместо отдельных
+        count_total, count_by_status и count_with_motion
+        
+        Returns:
+            dict: total, with_motion и by_status (количество по статусам)
+        """
+        stmt = (
+            select(
+                VideoAnalysis.status,
+                func.count().label("total"),
+                func.count().filter(VideoAnalysis.motion_detected == True).label("with_motion")
+            )
+            .group_by(VideoAnalysis.status)
+        )
+        
+        rows = self.db.execute(stmt).all()
+        
+        return {
+            "total": sum(row.total for row in rows),
+            "with_motion": sum(row.with_motion for row in rows),
+            "by_status": {row.status: row.total for row in rows},
+        }
@@ -3,7 +3,7 @@
 """
 from fastapi import FastAPI, status, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from contextlib import asynccontextmanager
 import logging
@@ -12,13 +12,12 @@ import time
 from src.config import settings
 from src.db.database import check_db_connection
 from src.api.endpoints import router as api_router
-from src.utils.exceptions import VisionGuardException
+from src.services.metrics import metrics_collector
+from src.utils.exceptions import VisionGuardException, VideoTooLargeError
+from src.utils.logging_utils import setup_logging
 
-# Настройка логирования
-logging.basicConfig(
-    level=getattr(logging, settings.LOG_LEVEL),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Настройка логирования (запись в stderr выполняется в отдельном потоке)
+setup_logging(settings.LOG_LEVEL, settings.LOG_FORMAT)
 logger = logging.getLogger(__name__)
 
 
@@ -43,6 +42,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info(f"Shutting down {settings.APP_NAME}")
+    metrics_collector.mark_process_dead()
 
 
 # Создание FastAPI приложения
@@ -53,8 +53,40 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,  # Быстрая сериализация ответов через orjson
 )
 
+# Запас на служебные части multipart запроса сверх размера самого файла
+UPLOAD_SIZE_OVERHEAD = 1024 * 1024
+
+# Максимальный размер тела запроса (вычисляется один раз, а не на каждый запрос)
+MAX_REQUEST_SIZE = settings.MAX_UPLOAD_SIZE + UPLOAD_SIZE_OVERHEAD
+
+
+# Middleware для ограничения размера запроса
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    """Отклонение слишком больших запросов по Content-Length до чтения тела"""
+    content_length = request.headers.get("content-length", "")
+    
+    if content_length.isdigit() and int(content_length) > MAX_REQUEST_SIZE:
+        error = VideoTooLargeError(int(content_length) / (1024 * 1024), settings.MAX_VIDEO_SIZE_MB)
+        logger.warning(f"Request rejected: {error}")
+        return JSONResponse(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            content={
+                "error": "VideoTooLargeError",
+                "message": str(error),
+                "details": {
+                    "size_mb": error.size_mb,
+                    "max_size_mb": error.max_size_mb
+                }
+            }
+        )
+    
+    return await call_next(request)
+
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -75,9 +107,17 @@ async def log_requests(request: Request, call_next):
     
     process_time = time.time() - start_time
     logger.info(
-        f"{request.method} {request.url.path} "
-        f"completed in {process_time:.3f}s "
-        f"with status {response.status_code}"
+        "%s %s completed in %.3fs with status %s",
+        request.method,
+        request.url.path,
+        process_time,
+        response.status_code,
+        extra={
+            "method": request.method,
+            "path": request.url.path,
+            "duration_ms": round(process_time * 1000, 2),
+            "status_code": response.status_code,
+        }
     )
     
     return response
@@ -1,12 +1,45 @@
 """
 Prometheus метрики для мониторинга
 """
-from prometheus_client import Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+    multiprocess,
+    CONTENT_TYPE_LATEST,
+)
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
 
+def _create_registry() -> CollectorRegistry:
+    """
+    Реестр, из которого отдаются метрики
+    
+    При запуске в нескольких процессах (uvicorn/gunicorn workers) задается
+    PROMETHEUS_MULTIPROC_DIR: каждый процесс пишет значения в свои файлы,
+    а MultiProcessCollector агрегирует их при запросе /metrics
+    
+    Returns:
+        CollectorRegistry: Реестр метрик
+    """
+    if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        return REGISTRY
+    
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    logger.info("Prometheus metrics: multiprocess mode")
+    return registry
+
+
+registry = _create_registry()
+
+
 # Counter - всегда растёт
 videos_processed_total = Counter(
     'videos_processed_total',
@@ -27,7 +60,9 @@ videos_motion_detected_total = Counter(
 # Gauge - может увеличиваться и уменьшаться
 videos_processing_time_seconds = Gauge(
     'videos_processing_time_seconds',
-    'Average video processing time in seconds'
+    'Average video processing time in seconds',
+    # В multiprocess режиме - последнее значение среди живых процессов
+    multiprocess_mode='livemostrecent'
 )
 
 # Histogram - для распределения времени обработки
@@ -78,6 +113,26 @@ class MetricsCollector:
         processing_duration_histogram.observe(seconds)
         logger.debug(f"Metric: processing time updated - {seconds:.2f}s")
     
+    @staticmethod
+    def record_result(processing_time: float, motion_detected: bool) -> None:
+        """
+        Записать все метрики успешно обработанного видео одним вызовом
+        
+        Args:
+            processing_time: Время обработки в секундах
+            motion_detected: Обнаружено ли движение
+        """
+        videos_processed_total.inc()
+        videos_processing_time_seconds.set(processing_time)
+        processing_duration_histogram.observe(processing_time)
+        
+        if motion_detected:
+            videos_motion_detected_total.inc()
+        
+        logger.debug(
+            f"Metric: result recorded - time={processing_time:.2f}s, motion={motion_detected}"
+        )
+    
     @staticmethod
     def get_metrics_output() -> tuple[str, str]:
         """
@@ -86,7 +141,13 @@ class MetricsCollector:
         Returns:
             tuple: (metrics_content, content_type)
         """
-        return generate_latest(), CONTENT_TYPE_LATEST
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    
+    @staticmethod
+    def mark_process_dead() -> None:
+        """Убрать значения live-метрик завершающегося процесса (multiprocess режим)"""
+        if registry is not REGISTRY:
+            multiprocess.mark_process_dead(os.getpid())
 
 
 # Singleton instance
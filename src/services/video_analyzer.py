@@ -2,10 +2,14 @@
 Анализатор видео для детекции движения
 """
 import cv2
+import multiprocessing
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import logging
+import queue
+import threading
 import time
 
 from src.config import settings
@@ -13,11 +17,39 @@ from src.utils.exceptions import VideoProcessingError, InvalidVideoError
 
 logger = logging.getLogger(__name__)
 
+# Количество пар кадров, обрабатываемых одним пакетом в _detect_motion_batch
+MOTION_BATCH_SIZE = 16
+
+# Количество буферов пакетов, по которым чередуются чтение и детекция
+BATCH_BUFFERS = 2
+
+# Порог изменения яркости пикселя (0-255), выше которого пиксель считается
+# измененным. Сравнение выполняется прямо над uint8 разницей кадров
+PIXEL_DIFF_THRESHOLD = 25
+
+# Доля кадров с движением (%), начиная с которой в видео есть движение
+MOTION_FRAMES_PERCENT = 10.0
+
+# Маркер окончания потока пакетов в очереди
+_END_OF_FRAMES = object()
+
 
 class VideoAnalysisResult:
     """
     Результат анализа видео
     """
+    __slots__ = (
+        "motion_detected",
+        "frames_analyzed",
+        "processing_time",
+        "total_frames",
+        "motion_percentage",
+        "avg_motion_intensity",
+        "fps",
+        "width",
+        "height",
+    )
+    
     def __init__(
         self,
         motion_detected: bool,
@@ -25,7 +57,10 @@ class VideoAnalysisResult:
         processing_time: float,
         total_frames: int = 0,
         motion_percentage: float = 0.0,
-        avg_motion_intensity: float = 0.0
+        avg_motion_intensity: float = 0.0,
+        fps: float = 0.0,
+        width: int = 0,
+        height: int = 0
     ):
         self.motion_detected = motion_detected
         self.frames_analyzed = frames_analyzed
@@ -33,6 +68,9 @@ class VideoAnalysisResult:
         self.total_frames = total_frames
         self.motion_percentage = motion_percentage
         self.avg_motion_intensity = avg_motion_intensity
+        self.fps = fps
+        self.width = width
+        self.height = height
     
     def to_dict(self) -> Dict:
         """Преобразование в словарь"""
@@ -58,7 +96,9 @@ class VideoAnalyzer:
         frame_sample_rate: Optional[int] = None,
         motion_threshold: Optional[float] = None,
         processing_width: Optional[int] = None,
-        processing_height: Optional[int] = None
+        processing_height: Optional[int] = None,
+        hw_acceleration: Optional[bool] = None,
+        workers: Optional[int] = None
     ):
         """
         Инициализация анализатора
@@ -68,17 +108,25 @@ class VideoAnalyzer:
             motion_threshold: Порог для определения движения (0.0-1.0)
             processing_width: Ширина кадра для обработки
             processing_height: Высота кадра для обработки
+            hw_acceleration: Использовать аппаратное декодирование, если доступно
+            workers: Количество процессов для анализа длинных видео по сегментам
         """
         self.frame_sample_rate = frame_sample_rate or settings.FRAME_SAMPLE_RATE
         self.motion_threshold = motion_threshold or settings.MOTION_THRESHOLD
         self.processing_width = processing_width or settings.PROCESSING_WIDTH
         self.processing_height = processing_height or settings.PROCESSING_HEIGHT
+        self.hw_acceleration = (
+            settings.VIDEO_HW_ACCELERATION if hw_acceleration is None else hw_acceleration
+        )
+        self.workers = workers or settings.ANALYSIS_WORKERS
         
         logger.info(
             f"VideoAnalyzer initialized: "
             f"sample_rate={self.frame_sample_rate}, "
             f"threshold={self.motion_threshold}, "
-            f"resolution={self.processing_width}x{self.processing_height}"
+            f"resolution={self.processing_width}x{self.processing_height}, "
+            f"hw_acceleration={self.hw_acceleration}, "
+            f"workers={self.workers}"
         )
     
     def analyze(self, video_path: Path) -> VideoAnalysisResult:
@@ -99,13 +147,26 @@ class VideoAnalyzer:
         start_time = time.time()
         
         # Открытие видео
-        cap = cv2.VideoCapture(str(video_path))
+        cap = self._open_capture(video_path)
         
         if not cap.isOpened():
             raise InvalidVideoError(f"Cannot open video file: {video_path}")
         
         try:
-            result = self._process_video(cap)
+            # Метаданные читаются при том же открытии файла, что и кадры
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            
+            if self.workers > 1 and total_frames >= settings.PARALLEL_ANALYSIS_MIN_FRAMES:
+                result = self._process_segments(video_path, total_frames)
+            else:
+                result = self._process_video(cap)
+            
+            result.fps = fps
+            result.width = width
+            result.height = height
             
             processing_time = time.time() - start_time
             result.processing_time = processing_time
@@ -124,6 +185,36 @@ class VideoAnalyzer:
         finally:
             cap.release()
     
+    def _open_capture(self, video_path: Path) -> cv2.VideoCapture:
+        """
+        Открытие видеофайла для чтения
+        
+        При включенном hw_acceleration OpenCV (бэкенд FFmpeg) декодирует
+        кадры аппаратно (NVDEC, VAAPI, D3D11 - в зависимости от сборки
+        и системы), а при отсутствии ускорителя - программно
+        
+        Args:
+            video_path: Путь к видеофайлу
+            
+        Returns:
+            cv2.VideoCapture: Объект для чтения кадров
+        """
+        if self.hw_acceleration:
+            cap = cv2.VideoCapture(
+                str(video_path),
+                cv2.CAP_FFMPEG,
+                [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY]
+            )
+            
+            if cap.isOpened():
+                logger.debug(
+                    f"Video opened with hw_acceleration="
+                    f"{int(cap.get(cv2.CAP_PROP_HW_ACCELERATION))}"
+                )
+                return cap
+        
+        return cv2.VideoCapture(str(video_path))
+    
     def _process_video(self, cap: cv2.VideoCapture) -> VideoAnalysisResult:
         """
         Обработка видео и детекция движения
@@ -134,52 +225,211 @@ class VideoAnalyzer:
         Returns:
             VideoAnalysisResult: Результат анализа
         """
-        frame_count = 0
-        frames_analyzed = 0
-        motion_frames = 0
-        prev_frame = None
-        total_motion_intensity = 0.0
-        
         total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
         
         logger.debug(f"Total frames in video: {total_frames}")
         
-        while True:
-            ret, frame = cap.read()
-            
-            if not ret:
-                break
-            
-            frame_count += 1
-            
-            # Анализируем только каждый N-й кадр для оптимизации
-            if frame_count % self.frame_sample_rate != 0:
-                continue
+        # При MOTION_EARLY_EXIT чтение прекращается, как только кадров с
+        # движением больше MOTION_FRAMES_PERCENT от всех анализируемых кадров
+        # видео: оставшиеся кадры уже не могут изменить вывод о движении
+        motion_frames_limit = None
+        if settings.MOTION_EARLY_EXIT and total_frames > 0:
+            sampled_frames = total_frames // self.frame_sample_rate
+            motion_frames_limit = int(sampled_frames * MOTION_FRAMES_PERCENT / 100) + 1
+        
+        frames_analyzed, motion_frames, total_motion_intensity = self._scan_motion(
+            cap, motion_frames_limit=motion_frames_limit
+        )
+        
+        return self._build_result(
+            total_frames, frames_analyzed, motion_frames, total_motion_intensity
+        )
+    
+    def _process_segments(self, video_path: Path, total_frames: int) -> VideoAnalysisResult:
+        """
+        Обработка длинного видео по временным сегментам в отдельных процессах
+        
+        Границы сегментов кратны frame_sample_rate, а каждый сегмент, кроме
+        первого, начинается с последнего анализируемого кадра предыдущего
+        (опорный кадр). Поэтому набор сравниваемых пар кадров и результат
+        совпадают с последовательной обработкой
+        
+        Args:
+            video_path: Путь к видеофайлу
+            total_frames: Количество кадров в видео
             
-            frames_analyzed += 1
+        Returns:
+            VideoAnalysisResult: Результат анализа
+        """
+        sampled_frames = total_frames // self.frame_sample_rate
+        segments = min(self.workers, max(sampled_frames, 1))
+        bounds = [
+            sampled_frames * i // segments * self.frame_sample_rate
+            for i in range(segments)
+        ]
+        
+        logger.debug(f"Analyzing {total_frames} frames in {segments} segments: {bounds}")
+        
+        params = {
+            "frame_sample_rate": self.frame_sample_rate,
+            "motion_threshold": self.motion_threshold,
+            "processing_width": self.processing_width,
+            "processing_height": self.processing_height,
+            "hw_acceleration": self.hw_acceleration,
+        }
+        
+        # spawn: fork процесса с потоками (OpenCV, uvicorn) небезопасен
+        with ProcessPoolExecutor(
+            max_workers=segments,
+            mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _analyze_segment,
+                    str(video_path),
+                    params,
+                    start,
+                    bounds[i + 1] if i + 1 < segments else None
+                )
+                for i, start in enumerate(bounds)
+            ]
+            segment_results = [future.result() for future in futures]
+        
+        frames_analyzed = sum(r[0] for r in segment_results)
+        motion_frames = sum(r[1] for r in segment_results)
+        total_motion_intensity = sum(r[2] for r in segment_results)
+        
+        return self._build_result(
+            total_frames, frames_analyzed, motion_frames, total_motion_intensity
+        )
+    
+    def _scan_motion(
+        self,
+        cap: cv2.VideoCapture,
+        start_frame: int = 0,
+        end_frame: Optional[int] = None,
+        motion_frames_limit: Optional[int] = None
+    ) -> Tuple[int, int, float]:
+        """
+        Детекция движения в диапазоне кадров видео
+        
+        Args:
+            cap: OpenCV VideoCapture объект
+            start_frame: Количество кадров перед диапазоном (кратно frame_sample_rate).
+                Если больше 0, последний из них читается как опорный кадр
+                и в статистику не входит
+            end_frame: Номер последнего кадра диапазона (None - до конца видео)
+            motion_frames_limit: Остановить чтение, когда найдено столько
+                кадров с движением (None - читать весь диапазон)
             
-            # Обработка кадра
-            processed_frame = self._preprocess_frame(frame)
+        Returns:
+            tuple: (frames_analyzed, motion_frames, total_motion_intensity)
+        """
+        frames_analyzed = 0
+        motion_frames = 0
+        total_motion_intensity = 0.0
+        
+        first_frame = 0
+        if start_frame > 0:
+            first_frame = start_frame - 1
+            cap.set(cv2.CAP_PROP_POS_FRAMES, first_frame)
+            # Опорный кадр сравнивается с первым кадром диапазона,
+            # но сам принадлежит предыдущему сегменту
+            frames_analyzed = -1
+        
+        # Обработанные кадры (размер после pyrDown) записываются прямо
+        # в непрерывные буферы пакетов и сравниваются пакетом. Слот 0
+        # хранит последний кадр предыдущего пакета, чтобы пара на границе
+        # пакетов тоже была учтена. Буферы выделяются на вызов, а не
+        # в экземпляре: анализатор используется из нескольких потоков
+        free_batches: queue.Queue = queue.Queue()
+        for _ in range(BATCH_BUFFERS):
+            free_batches.put(np.empty(
+                (
+                    MOTION_BATCH_SIZE + 1,
+                    (self.processing_height + 1) // 2,
+                    (self.processing_width + 1) // 2
+                ),
+                dtype=np.uint8
+            ))
+        
+        # Декодирование и предобработка идут в отдельном потоке, детекция
+        # движения - в текущем. OpenCV отпускает GIL, поэтому поток чтения
+        # заполняет один буфер, пока в текущем обрабатывается другой.
+        # Обе очереди ограничены числом буферов: поток чтения не уходит
+        # вперед детекции больше чем на BATCH_BUFFERS пакетов
+        ready_batches: queue.Queue = queue.Queue(maxsize=BATCH_BUFFERS)
+        stop_event = threading.Event()
+        errors: List[Exception] = []
+        reader = threading.Thread(
+            target=self._read_frames,
+            args=(
+                cap, free_batches, ready_batches, stop_event, errors,
+                first_frame, end_frame
+            ),
+            name="video-frame-reader",
+            daemon=True
+        )
+        reader.start()
+        
+        try:
+            carried = 0
             
-            if prev_frame is not None:
-                # Детекция движения между кадрами
-                motion_detected, motion_intensity = self._detect_motion(
-                    prev_frame, 
-                    processed_frame
-                )
+            while True:
+                item = ready_batches.get()
                 
-                if motion_detected:
-                    motion_frames += 1
-                    total_motion_intensity += motion_intensity
-            
-            prev_frame = processed_frame
+                if item is _END_OF_FRAMES:
+                    break
+                
+                batch, batch_filled = item
+                frames_analyzed += batch_filled - carried
+                carried = 1
+                
+                if batch_filled > 1:
+                    motion_frames, total_motion_intensity = self._accumulate_motion(
+                        batch[:batch_filled], motion_frames, total_motion_intensity
+                    )
+                
+                free_batches.put(batch)
+                
+                if motion_frames_limit is not None and motion_frames >= motion_frames_limit:
+                    logger.debug(f"Motion decided after {frames_analyzed} frames, stopping scan")
+                    break
+        
+        finally:
+            stop_event.set()
+            reader.join()
+        
+        if errors:
+            raise errors[0]
         
+        return max(frames_analyzed, 0), motion_frames, total_motion_intensity
+    
+    def _build_result(
+        self,
+        total_frames: int,
+        frames_analyzed: int,
+        motion_frames: int,
+        total_motion_intensity: float
+    ) -> VideoAnalysisResult:
+        """
+        Вычисление итогового результата по накопленной статистике
+        
+        Args:
+            total_frames: Количество кадров в видео
+            frames_analyzed: Количество проанализированных кадров
+            motion_frames: Количество кадров с движением
+            total_motion_intensity: Суммарная интенсивность движения
+            
+        Returns:
+            VideoAnalysisResult: Результат анализа
+        """
         # Вычисление результатов
         motion_percentage = (motion_frames / frames_analyzed * 100) if frames_analyzed > 0 else 0
         avg_motion_intensity = (total_motion_intensity / motion_frames) if motion_frames > 0 else 0
         
         # Определяем наличие движения: если больше 10% кадров содержат движение
-        has_motion = motion_percentage > 10.0
+        has_motion = motion_percentage > MOTION_FRAMES_PERCENT
         
         logger.debug(
             f"Analysis results: frames_analyzed={frames_analyzed}, "
@@ -195,29 +445,197 @@ class VideoAnalyzer:
             avg_motion_intensity=avg_motion_intensity
         )
     
-    def _preprocess_frame(self, frame: np.ndarray) -> np.ndarray:
+    def _read_frames(
+        self,
+        cap: cv2.VideoCapture,
+        free_batches: queue.Queue,
+        ready_batches: queue.Queue,
+        stop_event: threading.Event,
+        errors: List[Exception],
+        frame_count: int = 0,
+        end_frame: Optional[int] = None
+    ) -> None:
+        """
+        Чтение и предобработка кадров для _scan_motion (выполняется в потоке)
+        
+        Кадры записываются в свободный буфер пакета; заполненный пакет
+        передается в ready_batches как (буфер, количество кадров)
+        
+        Args:
+            cap: OpenCV VideoCapture объект
+            free_batches: Очередь свободных буферов пакетов
+            ready_batches: Очередь заполненных пакетов
+            stop_event: Сигнал досрочной остановки чтения
+            errors: Список для передачи исключения в основной поток
+            frame_count: Количество кадров перед текущей позицией cap
+            end_frame: Номер последнего читаемого кадра (None - до конца видео)
+        """
+        batch = None
+        batch_filled = 0
+        
+        try:
+            batch = self._take_batch(free_batches, stop_event)
+            
+            # Промежуточные буферы предобработки переиспользуются для всех кадров
+            resized = np.empty(
+                (self.processing_height, self.processing_width, 3), dtype=np.uint8
+            )
+            gray = np.empty((self.processing_height, self.processing_width), dtype=np.uint8)
+            
+            while batch is not None and not stop_event.is_set():
+                frame_count += 1
+                
+                if end_frame is not None and frame_count > end_frame:
+                    break
+                
+                # Анализируем только каждый N-й кадр для оптимизации.
+                # Пропускаемые кадры только извлекаются из потока (grab),
+                # без конвертации в BGR и копирования в numpy массив
+                if frame_count % self.frame_sample_rate != 0:
+                    if not cap.grab():
+                        break
+                    continue
+                
+                ret, frame = cap.read()
+                
+                if not ret:
+                    break
+                
+                self._preprocess_frame(
+                    frame, dst=batch[batch_filled], resized=resized, gray=gray
+                )
+                batch_filled += 1
+                
+                if batch_filled == len(batch):
+                    next_batch = self._take_batch(free_batches, stop_event)
+                    
+                    if next_batch is not None:
+                        next_batch[0] = batch[-1]
+                    
+                    self._put_batch(ready_batches, (batch, batch_filled), stop_event)
+                    batch, batch_filled = next_batch, 1
+        
+        except Exception as e:
+            errors.append(e)
+        
+        finally:
+            if batch is not None and batch_filled > 0:
+                self._put_batch(ready_batches, (batch, batch_filled), stop_event)
+            self._put_batch(ready_batches, _END_OF_FRAMES, stop_event)
+    
+    @staticmethod
+    def _take_batch(
+        free_batches: queue.Queue,
+        stop_event: threading.Event
+    ) -> Optional[np.ndarray]:
+        """
+        Ожидание свободного буфера пакета
+        
+        Args:
+            free_batches: Очередь свободных буферов пакетов
+            stop_event: Сигнал досрочной остановки чтения
+            
+        Returns:
+            Optional[np.ndarray]: Буфер или None, если чтение остановлено
+        """
+        while not stop_event.is_set():
+            try:
+                return free_batches.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        
+        return None
+    
+    @staticmethod
+    def _put_batch(
+        ready_batches: queue.Queue,
+        item: Any,
+        stop_event: threading.Event
+    ) -> bool:
+        """
+        Передача пакета (или маркера окончания) в ограниченную очередь
+        
+        Если детекция остановлена и очередь больше не читается,
+        элемент отбрасывается, чтобы поток чтения мог завершиться
+        
+        Args:
+            ready_batches: Очередь заполненных пакетов
+            item: Пакет (буфер, количество кадров) или _END_OF_FRAMES
+            stop_event: Сигнал досрочной остановки чтения
+            
+        Returns:
+            bool: True если элемент помещен в очередь
+        """
+        while not stop_event.is_set():
+            try:
+                ready_batches.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        
+        return False
+    
+    def _preprocess_frame(
+        self,
+        frame: np.ndarray,
+        dst: Optional[np.ndarray] = None,
+        resized: Optional[np.ndarray] = None,
+        gray: Optional[np.ndarray] = None
+    ) -> np.ndarray:
         """
         Предобработка кадра для анализа
         
         Args:
             frame: Исходный кадр
+            dst: Буфер для результата (по умолчанию выделяется новый)
+            resized: Буфер для кадра после изменения размера
+            gray: Буфер для кадра в оттенках серого
             
         Returns:
-            np.ndarray: Обработанный кадр
+            np.ndarray: Обработанный кадр в оттенках серого,
+                вдвое меньше processing_width x processing_height
         """
-        # Изменение размера для оптимизации
-        resized = cv2.resize(
-            frame, 
-            (self.processing_width, self.processing_height)
-        )
+        # Изменение размера для оптимизации. INTER_AREA усредняет исходные
+        # пиксели при уменьшении; кадр нужного размера не копируется
+        if frame.shape[:2] != (self.processing_height, self.processing_width):
+            frame = cv2.resize(
+                frame, 
+                (self.processing_width, self.processing_height),
+                dst=resized,
+                interpolation=cv2.INTER_AREA
+            )
         
         # Преобразование в grayscale
-        gray = cv2.cvtColor(resized, cv2.COLOR_BGR2GRAY)
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=gray)
+        
+        # Уменьшение вдвое гауссовой пирамидой (5x5 фильтр + прореживание)
+        # заодно подавляет шум - отдельный GaussianBlur 21x21 не нужен
+        return cv2.pyrDown(gray, dst=dst)
+    
+    def _accumulate_motion(
+        self,
+        frames: np.ndarray,
+        motion_frames: int,
+        total_motion_intensity: float
+    ) -> Tuple[int, float]:
+        """
+        Детекция движения в пакете кадров и накопление статистики
+        
+        Args:
+            frames: Последовательные обработанные кадры, shape (N, H, W)
+            motion_frames: Текущее количество кадров с движением
+            total_motion_intensity: Текущая суммарная интенсивность движения
+            
+        Returns:
+            tuple: (motion_frames, total_motion_intensity)
+        """
+        change_ratios, intensities = self._detect_motion_batch(frames)
+        motion_mask = change_ratios > self.motion_threshold
         
-        # Применение Gaussian blur для уменьшения шума
-        blurred = cv2.GaussianBlur(gray, (21, 21), 0)
+        motion_frames += int(np.count_nonzero(motion_mask))
+        total_motion_intensity += float(intensities[motion_mask].sum())
         
-        return blurred
+        return motion_frames, total_motion_intensity
     
     def _detect_motion(
         self, 
@@ -234,23 +652,11 @@ class VideoAnalyzer:
         Returns:
             tuple: (motion_detected, motion_intensity)
         """
-        # Вычисление абсолютной разницы между кадрами
-        frame_diff = cv2.absdiff(prev_frame, curr_frame)
-        
-        # Применение threshold для бинаризации
-        _, thresh = cv2.threshold(frame_diff, 25, 255, cv2.THRESH_BINARY)
-        
-        # Дилатация для объединения близких изменений
-        kernel = np.ones((5, 5), np.uint8)
-        dilated = cv2.dilate(thresh, kernel, iterations=2)
-        
-        # Подсчет процента измененных пикселей
-        total_pixels = dilated.size
-        changed_pixels = np.count_nonzero(dilated)
-        change_percentage = changed_pixels / total_pixels
-        
-        # Вычисление интенсивности движения
-        motion_intensity = float(np.mean(frame_diff) / 255.0)
+        change_ratios, intensities = self._detect_motion_batch(
+            np.stack((prev_frame, curr_frame))
+        )
+        change_percentage = float(change_ratios[0])
+        motion_intensity = float(intensities[0])
         
         # Определение наличия движения
         motion_detected = change_percentage > self.motion_threshold
@@ -263,6 +669,40 @@ class VideoAnalyzer:
         
         return motion_detected, motion_intensity
     
+    def _detect_motion_batch(self, frames: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Детекция движения между соседними кадрами пакета
+        
+        Разница, бинаризация и подсчет считаются одним проходом OpenCV/NumPy
+        для всего пакета: кадры лежат в непрерывном буфере, поэтому (N-1)
+        пар представляются как одно изображение высотой (N-1)*H
+        
+        Args:
+            frames: Последовательные обработанные кадры, shape (N, H, W)
+            
+        Returns:
+            tuple: (доли измененных пикселей, интенсивности движения) для N-1 пар
+        """
+        pairs, height, width = frames.shape[0] - 1, frames.shape[1], frames.shape[2]
+        
+        # Вычисление абсолютной разницы между кадрами
+        frame_diff = cv2.absdiff(
+            frames[:-1].reshape(-1, width),
+            frames[1:].reshape(-1, width)
+        ).reshape(pairs, -1)
+        
+        # Подсчет доли пикселей, изменившихся сильнее порога. Маска 0/1
+        # суммируется в uint32 - это быстрее count_nonzero по оси и
+        # float64 накопления в mean (переполнения нет: 255 * H * W < 2^32
+        # для кадров до ~16 млн пикселей)
+        _, changed = cv2.threshold(frame_diff, PIXEL_DIFF_THRESHOLD, 1, cv2.THRESH_BINARY)
+        change_ratios = changed.sum(axis=1, dtype=np.uint32) / (height * width)
+        
+        # Вычисление интенсивности движения
+        intensities = frame_diff.sum(axis=1, dtype=np.uint32) / (height * width * 255.0)
+        
+        return change_ratios, intensities
+    
     def analyze_with_details(self, video_path: Path) -> Dict:
         """
         Анализ видео с подробной информацией
@@ -274,18 +714,43 @@ class VideoAnalyzer:
             dict: Подробные результаты анализа
         """
         result = self.analyze(video_path)
-        
-        cap = cv2.VideoCapture(str(video_path))
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        duration = result.total_frames / fps if fps > 0 else 0
-        cap.release()
+        duration = result.total_frames / result.fps if result.fps > 0 else 0
         
         return {
             **result.to_dict(),
             "video_info": {
-                "fps": round(fps, 2),
+                "fps": round(result.fps, 2),
                 "duration_seconds": round(duration, 2),
-                "resolution": f"{int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))}x{int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))}"
+                "resolution": f"{result.width}x{result.height}"
             }
         }
 
+
+def _analyze_segment(
+    video_path: str,
+    params: Dict,
+    start_frame: int,
+    end_frame: Optional[int]
+) -> Tuple[int, int, float]:
+    """
+    Детекция движения в сегменте видео (выполняется в дочернем процессе)
+    
+    Args:
+        video_path: Путь к видеофайлу
+        params: Параметры VideoAnalyzer
+        start_frame: Количество кадров перед сегментом
+        end_frame: Номер последнего кадра сегмента (None - до конца видео)
+        
+    Returns:
+        tuple: (frames_analyzed, motion_frames, total_motion_intensity)
+    """
+    analyzer = VideoAnalyzer(**params, workers=1)
+    cap = analyzer._open_capture(Path(video_path))
+    
+    if not cap.isOpened():
+        raise InvalidVideoError(f"Cannot open video file: {video_path}")
+    
+    try:
+        return analyzer._scan_motion(cap, start_frame, end_frame)
+    finally:
+        cap.release()
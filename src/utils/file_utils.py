@@ -1,17 +1,40 @@
 """
 Утилиты для работы с файлами
 """
+import errno
+import io
+import itertools
 import os
+import secrets
+import stat
 import tempfile
-import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import BinaryIO
+from typing import BinaryIO, List, Optional
 import logging
 
 from src.config import settings
+from src.utils.exceptions import VideoTooLargeError
 
 logger = logging.getLogger(__name__)
 
+# Размер буфера при копировании загружаемых файлов на диск
+UPLOAD_COPY_BUFFER_SIZE = 1024 * 1024
+
+# Количество потоков для удаления устаревших файлов
+CLEANUP_WORKERS = 8
+
+# Счетчик загрузок и токен запуска для уникальных имен файлов
+# (загрузки и временные файлы)
+_upload_counter = itertools.count()
+_RUN_TOKEN = secrets.token_hex(4)
+
+# Ошибки, при которых копирование средствами ядра недоступно
+_KERNEL_COPY_UNSUPPORTED = frozenset({
+    errno.EXDEV, errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP,
+    errno.EBADF, errno.ETXTBSY, errno.EPERM,
+})
+
 
 def ensure_upload_dir() -> Path:
     """
@@ -25,42 +48,156 @@ def ensure_upload_dir() -> Path:
     return upload_dir
 
 
-def save_upload_file(upload_file: BinaryIO, filename: str) -> Path:
+def save_upload_file(
+    upload_file: BinaryIO,
+    filename: str,
+    max_size_mb: Optional[int] = None
+) -> Path:
     """
     Сохранение загруженного файла во временную директорию
     
+    Копирование прерывается, как только записано больше max_size_mb:
+    слишком большой файл не дописывается на диск целиком
+    
     Args:
         upload_file: Файловый объект
         filename: Имя файла
+        max_size_mb: Максимальный размер файла в МБ
         
     Returns:
         Path: Путь к сохраненному файлу
+        
+    Raises:
+        VideoTooLargeError: Если файл больше max_size_mb
     """
+    max_size_mb = max_size_mb or settings.MAX_VIDEO_SIZE_MB
     upload_dir = ensure_upload_dir()
     
-    # Создаем уникальное имя файла с timestamp
-    import time
-    timestamp = int(time.time() * 1000)
-    safe_filename = f"{timestamp}_{filename}"
+    # Уникальное имя файла: PID + счетчик процесса (без зависимости от
+    # разрешения часов) + случайный токен запуска (PID повторяется после
+    # перезапуска контейнера, а старые файлы еще могут лежать на диске)
+    safe_filename = f"{os.getpid()}_{_RUN_TOKEN}_{next(_upload_counter)}_{filename}"
     file_path = upload_dir / safe_filename
     
     logger.info(f"Saving uploaded file to: {file_path}")
     
     try:
-        with open(file_path, "wb") as f:
-            shutil.copyfileobj(upload_file, f)
+        # Файл на диске копируется ядром (copy_file_range) без
+        # прохода данных через буферы Python; остальные потоки - по частям
+        if not _copy_file_in_kernel(upload_file, file_path, max_size_mb):
+            with open(file_path, "wb", buffering=UPLOAD_COPY_BUFFER_SIZE) as f:
+                _copy_with_limit(upload_file, f, max_size_mb)
         
         logger.info(f"File saved successfully: {file_path}")
         return file_path
         
     except Exception as e:
-        logger.error(f"Error saving file: {e}")
+        if isinstance(e, VideoTooLargeError):
+            logger.warning(f"Upload aborted: {e}")
+        else:
+            logger.error(f"Error saving file: {e}")
         # Попытка удалить частично записанный файл
         if file_path.exists():
             file_path.unlink()
         raise
 
 
+def _copy_file_in_kernel(source: BinaryIO, file_path: Path, max_size_mb: int) -> bool:
+    """
+    Копирование файла средствами ядра (zero-copy)
+    
+    Применяется, если у источника есть файловый дескриптор обычного файла
+    (например, SpooledTemporaryFile загрузки FastAPI) и доступен copy_file_range.
+    Копируются данные от текущей позиции источника до конца файла
+    
+    Args:
+        source: Исходный файловый объект
+        file_path: Путь для сохранения
+        max_size_mb: Максимальный размер в МБ
+        
+    Returns:
+        bool: True если файл скопирован, False если нужно копирование по частям
+        
+    Raises:
+        VideoTooLargeError: Если данных больше max_size_mb
+    """
+    # copy_file_range есть только в Linux; sendfile на macOS/BSD пишет
+    # только в сокет, поэтому на других платформах - копирование по частям
+    if not hasattr(os, "copy_file_range"):
+        return False
+    
+    try:
+        src_fd = source.fileno()
+        offset = source.tell()
+        src_stat = os.fstat(src_fd)
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return False
+    
+    # Размер известен только у обычного файла (не pipe/сокета)
+    if not stat.S_ISREG(src_stat.st_mode):
+        return False
+    
+    size = src_stat.st_size - offset
+    
+    if size > max_size_mb * 1024 * 1024:
+        raise VideoTooLargeError(size / (1024 * 1024), max_size_mb)
+    
+    dst_fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    
+    try:
+        copied = 0
+        
+        while copied < size:
+            try:
+                chunk = os.copy_file_range(src_fd, dst_fd, size - copied, offset + copied)
+            except OSError as e:
+                # Файловая система или ядро не поддерживают копирование
+                if copied == 0 and e.errno in _KERNEL_COPY_UNSUPPORTED:
+                    logger.debug(f"Kernel copy unavailable ({e}), falling back to buffered copy")
+                    return False
+                raise
+            
+            if chunk == 0:
+                break
+            copied += chunk
+    finally:
+        os.close(dst_fd)
+    
+    return True
+
+
+def _copy_with_limit(source: BinaryIO, destination: BinaryIO, max_size_mb: int) -> int:
+    """
+    Копирование потока с ограничением размера
+    
+    Args:
+        source: Исходный файловый объект
+        destination: Файловый объект для записи
+        max_size_mb: Максимальный размер в МБ
+        
+    Returns:
+        int: Количество записанных байт
+        
+    Raises:
+        VideoTooLargeError: Если данных больше max_size_mb
+    """
+    max_size_bytes = max_size_mb * 1024 * 1024
+    written = 0
+    
+    while True:
+        chunk = source.read(UPLOAD_COPY_BUFFER_SIZE)
+        if not chunk:
+            break
+        
+        written += len(chunk)
+        if written > max_size_bytes:
+            raise VideoTooLargeError(written / (1024 * 1024), max_size_mb)
+        
+        destination.write(chunk)
+    
+    return written
+
+
 def create_temp_file(suffix: str = ".mp4") -> Path:
     """
     Создание временного файла
@@ -71,9 +208,20 @@ def create_temp_file(suffix: str = ".mp4") -> Path:
     Returns:
         Path: Путь к временному файлу
     """
-    fd, path = tempfile.mkstemp(suffix=suffix, dir=settings.UPLOAD_DIR)
+    # Имя из счетчика процесса уникально - достаточно одного open с O_EXCL
+    # вместо цикла подбора случайных имен в mkstemp
+    path = Path(settings.UPLOAD_DIR) / (
+        f"tmp_{os.getpid()}_{_RUN_TOKEN}_{next(_upload_counter)}{suffix}"
+    )
+    
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        fd, fallback_path = tempfile.mkstemp(suffix=suffix, dir=settings.UPLOAD_DIR)
+        path = Path(fallback_path)
+    
     os.close(fd)
-    return Path(path)
+    return path
 
 
 def cleanup_file(file_path: Path) -> None:
@@ -103,44 +251,77 @@ def cleanup_old_files(max_age_hours: int = 24) -> int:
     """
     upload_dir = Path(settings.UPLOAD_DIR)
     
-    if not upload_dir.exists():
+    # scandir отдает тип записи из readdir - без отдельного stat на is_file.
+    # Отсутствие директории определяется по ошибке scandir, без exists()
+    try:
+        entries = os.scandir(upload_dir)
+    except FileNotFoundError:
         return 0
     
     import time
     current_time = time.time()
     max_age_seconds = max_age_hours * 3600
+    expired_paths: List[str] = []
     deleted_count = 0
     
     logger.info(f"Cleaning up old files (older than {max_age_hours}h)")
     
-    for file_path in upload_dir.iterdir():
-        if not file_path.is_file():
-            continue
-        
-        file_age = current_time - file_path.stat().st_mtime
-        
-        if file_age > max_age_seconds:
-            try:
-                file_path.unlink()
-                deleted_count += 1
-                logger.debug(f"Deleted old file: {file_path}")
-            except Exception as e:
-                logger.warning(f"Failed to delete {file_path}: {e}")
+    with entries:
+        for entry in entries:
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            
+            file_age = current_time - entry.stat(follow_symlinks=False).st_mtime
+            
+            if file_age > max_age_seconds:
+                expired_paths.append(entry.path)
+    
+    if expired_paths:
+        # unlink упирается в задержку журнала ФС - удаляем параллельно
+        workers = min(CLEANUP_WORKERS, len(expired_paths))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            deleted_count = sum(executor.map(_unlink_old_file, expired_paths))
     
     logger.info(f"Cleaned up {deleted_count} old files")
     return deleted_count
 
 
-def get_file_size_mb(file_path: Path) -> float:
+def _unlink_old_file(path: str) -> bool:
+    """
+    Удаление устаревшего файла
+    
+    Args:
+        path: Путь к файлу
+        
+    Returns:
+        bool: True если файл удален
+    """
+    try:
+        os.unlink(path)
+        logger.debug(f"Deleted old file: {path}")
+        return True
+    except Exception as e:
+        logger.warning(f"Failed to delete {path}: {e}")
+        return False
+
+
+def get_file_size_mb(
+    file_path: Path,
+    file_stat: Optional[os.stat_result] = None
+) -> float:
     """
     Получение размера файла в МБ
     
     Args:
         file_path: Путь к файлу
+        file_stat: Уже полученный stat файла (например, после валидации)
         
     Returns:
         float: Размер в МБ
     """
-    size_bytes = file_path.stat().st_size
+    if file_stat is None:
+        file_stat = os.stat(file_path)
+    
+    size_bytes = file_stat.st_size
     return size_bytes / (1024 * 1024)
 
@@ -0,0 +1,156 @@
+"""
+Настройка логирования приложения
+"""
+import atexit
+import copy
+import logging
+import queue
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+import orjson
+
+# Стандартные атрибуты LogRecord - все остальные считаются полями extra
+_RECORD_ATTRIBUTES = frozenset(
+    logging.LogRecord("", 0, "", 0, "", None, None).__dict__
+) | {"message", "asctime"}
+
+TEXT_LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Обработчик и listener, установленные setup_logging (для повторного вызова)
+_queue_handler: Optional[QueueHandler] = None
+_listener: Optional[QueueListener] = None
+_atexit_registered = False
+
+# Форматирование traceback при постановке записи в очередь
+_EXCEPTION_FORMATTER = logging.Formatter()
+
+
+class _RecordQueueHandler(QueueHandler):
+    """
+    QueueHandler, сохраняющий структуру записи
+    
+    Стандартный prepare() форматирует запись до постановки в очередь:
+    traceback склеивается с сообщением, а exc_info обнуляется. Здесь
+    подставляются только аргументы сообщения, traceback сохраняется
+    в exc_text, поэтому форматтер listener'а выводит его отдельно
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Подготовка записи к передаче в поток listener'а
+        
+        Args:
+            record: Запись лога
+        
+        Returns:
+            logging.LogRecord: Копия записи с подставленными аргументами
+        """
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _EXCEPTION_FORMATTER.formatException(record.exc_info)
+            # Traceback уже сохранен текстом - кадры стека не держим в очереди
+            record.exc_info = None
+        
+        return record
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Форматирование записей лога в JSON (одна строка на запись)
+    
+    Поля, переданные через extra, попадают в JSON как есть
+    """
+    
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Форматирование записи
+        
+        Args:
+            record: Запись лога
+        
+        Returns:
+            str: JSON строка
+        """
+        entry: Dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        
+        return orjson.dumps(entry, default=str).decode()
+
+
+def setup_logging(level: str, log_format: str) -> QueueListener:
+    """
+    Настройка корневого логгера с записью в отдельном потоке
+    
+    Обработчики запросов только кладут записи в очередь (QueueHandler),
+    а форматирование и запись в stderr выполняет QueueListener в своем
+    потоке - без ожидания глобальной блокировки обработчика
+    
+    Повторный вызов заменяет только обработчик, установленный предыдущим
+    вызовом; остальные обработчики корневого логгера не затрагиваются
+    
+    Args:
+        level: Уровень логирования (INFO, DEBUG, ...)
+        log_format: Формат вывода: "json" или текстовый
+    
+    Returns:
+        QueueListener: Запущенный listener (останавливается при выходе
+            из процесса, дописывая оставшиеся в очереди записи)
+    """
+    stream_handler = logging.StreamHandler()
+    
+    if log_format == "json":
+        stream_handler.setFormatter(JSONFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter(TEXT_LOG_FORMAT))
+    
+    global _queue_handler, _listener, _atexit_registered
+    
+    root_logger = logging.getLogger()
+    
+    if _queue_handler is not None:
+        root_logger.removeHandler(_queue_handler)
+    _stop_listener()
+    
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _queue_handler = _RecordQueueHandler(log_queue)
+    
+    root_logger.setLevel(logging.getLevelName(level))
+    root_logger.addHandler(_queue_handler)
+    
+    _listener.start()
+    
+    if not _atexit_registered:
+        atexit.register(_stop_listener)
+        _atexit_registered = True
+    
+    return _listener
+
+
+def _stop_listener() -> None:
+    """Остановка listener'а с записью оставшихся в очереди записей"""
+    global _listener
+    
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -1,6 +1,10 @@
 """
 Валидаторы для входных данных
 """
+import functools
+import os
+import stat
+import threading
 from pathlib import Path
 from typing import Optional
 import logging
@@ -20,6 +24,48 @@ from src.utils.exceptions import (
 
 logger = logging.getLogger(__name__)
 
+# Сколько байт начала файла читается для определения MIME типа:
+# сигнатуры видео контейнеров находятся в самом начале файла
+MIME_SNIFF_SIZE = 4096
+
+# Сколько байт сигнатуры выводится в лог для нераспознанного файла
+SIGNATURE_SIZE = 16
+
+# Боксы ISO BMFF, которые могут предшествовать ftyp (или заменять его
+# в старых файлах без ftyp) - при обходе заголовка они пропускаются
+_ISO_LEADING_BOXES = frozenset({b"free", b"skip", b"mdat", b"moov"})
+
+# Атомы, которые встречаются только в QuickTime (.mov)
+_QUICKTIME_ATOMS = frozenset({b"wide", b"pnot"})
+
+# Первые боксы фрагментированного/сегментированного MP4
+_FRAGMENTED_MP4_BOXES = frozenset({b"styp", b"moof", b"uuid", b"sidx"})
+
+
+@functools.lru_cache(maxsize=1)
+def _get_magic() -> Optional["magic.Magic"]:
+    """
+    Получение детектора MIME типов (создается один раз на процесс)
+    
+    Загрузка и компиляция базы сигнатур libmagic занимает заметное
+    время, поэтому экземпляр создается при первом вызове и переиспользуется
+    
+    Returns:
+        Optional[magic.Magic]: Детектор или None, если libmagic недоступна
+    """
+    if not HAS_MAGIC:
+        return None
+    
+    try:
+        return magic.Magic(mime=True)
+    except Exception as e:
+        logger.warning(f"Failed to load libmagic database: {e}, MIME type check disabled")
+        return None
+
+
+# Экземпляр libmagic не потокобезопасен, а валидация выполняется в пуле потоков
+_MAGIC_LOCK = threading.Lock()
+
 
 class VideoValidator:
     """
@@ -29,16 +75,16 @@ class VideoValidator:
     """
     
     # Поддерживаемые MIME типы
-    ALLOWED_MIME_TYPES = [
+    ALLOWED_MIME_TYPES = frozenset({
         'video/mp4',
         'video/x-msvideo',      # AVI
         'video/avi',            # AVI (альтернативный)
         'video/quicktime',      # MOV
         'video/x-matroska',     # MKV
-    ]
+    })
     
     # Поддерживаемые расширения
-    ALLOWED_EXTENSIONS = ['.mp4', '.avi', '.mov', '.mkv']
+    ALLOWED_EXTENSIONS = frozenset({'.mp4', '.avi', '.mov', '.mkv'})
     
     def __init__(self, max_size_mb: Optional[int] = None):
         """
@@ -50,17 +96,25 @@ class VideoValidator:
         self.max_size_mb = max_size_mb or settings.MAX_VIDEO_SIZE_MB
         self.max_size_bytes = self.max_size_mb * 1024 * 1024
     
-    def validate_file_size(self, file_path: Path) -> None:
+    def validate_file_size(
+        self,
+        file_path: Path,
+        file_stat: Optional[os.stat_result] = None
+    ) -> None:
         """
         Проверка размера файла
         
         Args:
             file_path: Путь к файлу
+            file_stat: Уже полученный stat файла (чтобы не вызывать stat повторно)
             
         Raises:
             VideoTooLargeError: Если файл слишком большой
         """
-        file_size = file_path.stat().st_size
+        if file_stat is None:
+            file_stat = os.stat(file_path)
+        
+        file_size = file_stat.st_size
         size_mb = file_size / (1024 * 1024)
         
         if file_size > self.max_size_bytes:
@@ -83,7 +137,7 @@ class VideoValidator:
         
         if ext not in self.ALLOWED_EXTENSIONS:
             logger.warning(f"Unsupported extension: {ext}")
-            raise UnsupportedFormatError(ext, self.ALLOWED_EXTENSIONS)
+            raise UnsupportedFormatError(ext, sorted(self.ALLOWED_EXTENSIONS))
         
         logger.debug(f"File extension OK: {ext}")
     
@@ -91,43 +145,161 @@ class VideoValidator:
         """
         Проверка MIME типа файла
         
+        Формат определяется по сигнатуре контейнера в первых байтах файла.
+        При VIDEO_DEEP_MIME_CHECK дополнительно выполняется проверка
+        через libmagic (если python-magic установлен)
+        
         Args:
             file_path: Путь к файлу
             
         Raises:
             UnsupportedFormatError: Если MIME тип не поддерживается
         """
-        if not HAS_MAGIC:
-            logger.debug("python-magic not installed, skipping MIME type check")
-            return
+        with open(file_path, "rb") as f:
+            header = f.read(MIME_SNIFF_SIZE)
         
-        try:
-            mime = magic.Magic(mime=True)
-            mime_type = mime.from_file(str(file_path))
+        mime_type = self.detect_container(header)
+        
+        if mime_type is None:
+            logger.warning(f"Unknown container signature: {header[:SIGNATURE_SIZE]!r}")
+            raise UnsupportedFormatError("unknown", sorted(self.ALLOWED_MIME_TYPES))
+        
+        logger.debug(f"Container signature OK: {mime_type}")
+        
+        if settings.VIDEO_DEEP_MIME_CHECK:
+            self._validate_mime_type_magic(header)
+    
+    @staticmethod
+    def detect_container(header: bytes) -> Optional[str]:
+        """
+        Определение MIME типа по сигнатуре видео контейнера
+        
+        Args:
+            header: Первые байты файла (MIME_SNIFF_SIZE байт)
             
-            if mime_type not in self.ALLOWED_MIME_TYPES:
-                logger.warning(f"Unsupported MIME type: {mime_type}")
-                raise UnsupportedFormatError(mime_type, self.ALLOWED_MIME_TYPES)
+        Returns:
+            Optional[str]: MIME тип или None, если сигнатура не распознана
+        """
+        iso_mime_type = VideoValidator._detect_iso_bmff(header)
+        if iso_mime_type is not None:
+            return iso_mime_type
+        
+        # AVI: RIFF контейнер с типом "AVI "
+        if header[:4] == b"RIFF" and header[8:12] == b"AVI ":
+            return "video/x-msvideo"
+        
+        # MKV: заголовок EBML
+        if header[:4] == b"\x1a\x45\xdf\xa3":
+            return "video/x-matroska"
+        
+        return None
+    
+    @staticmethod
+    def _detect_iso_bmff(header: bytes) -> Optional[str]:
+        """
+        Определение MP4/MOV по боксам ISO BMFF верхнего уровня
+        
+        Боксы (4 байта размера + 4 байта типа) обходятся в пределах
+        заголовка до ftyp. Перед ftyp допускаются free/skip/mdat/moov;
+        файл без ftyp считается QuickTime, только если в нем есть
+        атомы QuickTime
+        
+        Args:
+            header: Первые байты файла
+            
+        Returns:
+            Optional[str]: MIME тип или None, если это не ISO BMFF
+        """
+        offset = 0
+        has_iso_boxes = False
+        has_quicktime_atoms = False
+        
+        while offset + 8 <= len(header):
+            box_size = int.from_bytes(header[offset:offset + 4], "big")
+            box_type = header[offset + 4:offset + 8]
+            
+            # MP4/MOV: бокс ftyp, бренд "qt  " - QuickTime
+            if box_type == b"ftyp":
+                brand = header[offset + 8:offset + 12]
+                return "video/quicktime" if brand == b"qt  " else "video/mp4"
+            
+            if box_type in _FRAGMENTED_MP4_BOXES:
+                return "video/mp4"
+            
+            if box_type in _QUICKTIME_ATOMS:
+                has_quicktime_atoms = True
+            elif box_type not in _ISO_LEADING_BOXES:
+                break
+            
+            has_iso_boxes = True
+            
+            # Размер 1 - 64-битный размер после типа, 0 - бокс до конца файла
+            if box_size == 1:
+                if offset + 16 > len(header):
+                    break
+                box_size = int.from_bytes(header[offset + 8:offset + 16], "big")
+            elif box_size == 0:
+                break
+            
+            if box_size < 8:
+                break
+            offset += box_size
+        
+        if not has_iso_boxes:
+            return None
+        
+        return "video/quicktime" if has_quicktime_atoms else "video/mp4"
+    
+    def _validate_mime_type_magic(self, header: bytes) -> None:
+        """
+        Проверка MIME типа через libmagic
+        
+        Args:
+            header: Начало файла (MIME_SNIFF_SIZE байт)
             
-            logger.debug(f"MIME type OK: {mime_type}")
+        Raises:
+            UnsupportedFormatError: Если MIME тип не поддерживается
+        """
+        detector = _get_magic()
+        if detector is None:
+            logger.debug("python-magic not available, skipping MIME type check")
+            return
+        
+        try:
+            with _MAGIC_LOCK:
+                mime_type = detector.from_buffer(header)
         except Exception as e:
             logger.debug(f"Error checking MIME type: {e}, skipping check")
+            return
+        
+        if mime_type not in self.ALLOWED_MIME_TYPES:
+            logger.warning(f"Unsupported MIME type: {mime_type}")
+            raise UnsupportedFormatError(mime_type, sorted(self.ALLOWED_MIME_TYPES))
+        
+        logger.debug(f"MIME type OK: {mime_type}")
     
-    def validate_file_exists(self, file_path: Path) -> None:
+    def validate_file_exists(self, file_path: Path) -> os.stat_result:
         """
         Проверка существования файла
         
         Args:
             file_path: Путь к файлу
             
+        Returns:
+            os.stat_result: stat файла для остальных проверок
+            
         Raises:
             InvalidVideoError: Если файл не существует или не является файлом
         """
-        if not file_path.exists():
+        try:
+            file_stat = os.stat(file_path)
+        except OSError:
             raise InvalidVideoError(f"File does not exist: {file_path}")
         
-        if not file_path.is_file():
+        if not stat.S_ISREG(file_stat.st_mode):
             raise InvalidVideoError(f"Path is not a file: {file_path}")
+        
+        return file_stat
     
     def validate(self, file_path: Path) -> None:
         """
@@ -143,8 +315,9 @@ class VideoValidator:
         """
         logger.info(f"Validating video file: {file_path}")
         
-        self.validate_file_exists(file_path)
-        self.validate_file_size(file_path)
+        # Один stat на всю валидацию вместо отдельных exists/is_file/stat
+        file_stat = self.validate_file_exists(file_path)
+        self.validate_file_size(file_path, file_stat)
         self.validate_file_extension(file_path)
         self.validate_mime_type(file_path)
         
@@ -3,38 +3,79 @@ Pytest fixtures и конфигурация
 """
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from pathlib import Path
 
 from src.main import app
 from src.db.database import Base, get_db
 
 
-# Тестовая база данных в памяти
+# Тестовая база данных в памяти. StaticPool - одно соединение на все
+# сессии: каждое новое соединение к :memory: было бы отдельной пустой БД
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False}
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool
 )
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False)
 
 
-@pytest.fixture
-def test_db():
-    """Fixture для тестовой базы данных"""
+# pysqlite сам управляет BEGIN и не поддерживает SAVEPOINT внутри
+# транзакции - передаем управление транзакциями SQLAlchemy
+@event.listens_for(engine, "connect")
+def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(engine, "begin")
+def _begin_sqlite_transaction(connection):
+    connection.exec_driver_sql("BEGIN")
+
+
+@pytest.fixture(scope="session")
+def test_schema():
+    """Fixture для схемы тестовой БД (создается один раз на сессию)"""
     Base.metadata.create_all(bind=engine)
-    db = TestingSessionLocal()
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def test_db(test_schema):
+    """
+    Fixture для тестовой базы данных
+    
+    Тест выполняется внутри внешней транзакции, которая откатывается
+    после теста; commit() в коде освобождает только SAVEPOINT
+    """
+    connection = engine.connect()
+    transaction = connection.begin()
+    db = TestingSessionLocal(bind=connection, join_transaction_mode="create_savepoint")
     try:
         yield db
     finally:
         db.close()
-        Base.metadata.drop_all(bind=engine)
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture(scope="session")
+def session_client():
+    """
+    Fixture для FastAPI тестового клиента, общего на всю сессию
+    
+    lifespan приложения (startup/shutdown) выполняется один раз
+    """
+    with TestClient(app) as client:
+        yield client
 
 
 @pytest.fixture
-def test_client(test_db):
+def test_client(session_client, test_db):
     """Fixture для FastAPI тестового клиента с тестовой БД"""
     def override_get_db():
         try:
@@ -44,10 +85,10 @@ def test_client(test_db):
     
     app.dependency_overrides[get_db] = override_get_db
     
-    with TestClient(app) as client:
-        yield client
-    
-    app.dependency_overrides.clear()
+    try:
+        yield session_client
+    finally:
+        app.dependency_overrides.clear()
 
 
 @pytest.fixture(scope="session")
@@ -62,13 +103,10 @@ def generate_test_videos(test_videos_path):
     static_video = test_videos_path / "static_video.mp4"
     
     if not static_video.exists():
-        # Генерируем тестовые видео если их нет
-        import subprocess
+        # Генерируем тестовые видео если их нет (в текущем процессе,
+        # без запуска отдельного интерпретатора)
+        from scripts import generate_test_video
         try:
-            subprocess.run(
-                ["python", "scripts/generate_test_video.py"],
-                check=True,
-                capture_output=True
-            )
-        except subprocess.CalledProcessError:
+            generate_test_video.main()
+        except Exception:
             pytest.skip("Could not generate test videos")
@@ -2,21 +2,16 @@
 Интеграционные тесты для API endpoints
 """
 import pytest
-from fastapi.testclient import TestClient
 from pathlib import Path
 import io
 
-from src.main import app
-
-client = TestClient(app)
-
 
 class TestRootEndpoints:
     """Тесты для корневых endpoints"""
     
-    def test_root_endpoint(self):
+    def test_root_endpoint(self, session_client):
         """Тест корневого endpoint"""
-        response = client.get("/")
+        response = session_client.get("/")
         
         assert response.status_code == 200
         data = response.json()
@@ -24,9 +19,9 @@ class TestRootEndpoints:
         assert data["status"] == "running"
         assert "version" in data
     
-    def test_health_endpoint(self):
+    def test_health_endpoint(self, session_client):
         """Тест health check endpoint"""
-        response = client.get("/health")
+        response = session_client.get("/health")
         
         assert response.status_code == 200
         data = response.json()
@@ -42,13 +37,13 @@ class TestAnalyzeEndpoint:
         not Path("tests/fixtures/static_video.mp4").exists(),
         reason="Test video not found"
     )
-    def test_analyze_static_video_success(self):
+    def test_analyze_static_video_success(self, test_client):
         """Тест анализа статичного видео - успех"""
         video_path = Path("tests/fixtures/static_video.mp4")
         
         with open(video_path, "rb") as f:
             files = {"file": ("static_video.mp4", f, "video/mp4")}
-            response = client.post("/api/v1/analyze", files=files)
+            response = test_client.post("/api/v1/analyze", files=files)
         
         assert response.status_code == 200
         data = response.json()
@@ -65,13 +60,13 @@ class TestAnalyzeEndpoint:
         not Path("tests/fixtures/motion_video.mp4").exists(),
         reason="Test video not found"
     )
-    def test_analyze_motion_video_success(self):
+    def test_analyze_motion_video_success(self, test_client):
         """Тест анализа видео с движением - успех"""
         video_path = Path("tests/fixtures/motion_video.mp4")
         
         with open(video_path, "rb") as f:
             files = {"file": ("motion_video.mp4", f, "video/mp4")}
-            response = client.post("/api/v1/analyze", files=files)
+            response = test_client.post("/api/v1/analyze", files=files)
         
         assert response.status_code == 200
         data = response.json()
@@ -81,21 +76,21 @@ class TestAnalyzeEndpoint:
         assert data["frames_analyzed"] > 0
         assert data["status"] == "completed"
     
-    def test_analyze_unsupported_format(self):
+    def test_analyze_unsupported_format(self, test_client):
         """Тест загрузки файла неподдерживаемого формата"""
         # Создаем поддельный текстовый файл
         fake_file = io.BytesIO(b"This is not a video")
         files = {"file": ("test.txt", fake_file, "text/plain")}
         
-        response = client.post("/api/v1/analyze", files=files)
+        response = test_client.post("/api/v1/analyze", files=files)
         
         assert response.status_code == 415  # Unsupported Media Type
         data = response.json()
         assert "error" in data
     
-    def test_analyze_no_file(self):
+    def test_analyze_no_file(self, test_client):
         """Тест запроса без файла"""
-        response = client.post("/api/v1/analyze")
+        response = test_client.post("/api/v1/analyze")
         
         assert response.status_code == 422  # Validation Error
 
@@ -103,29 +98,30 @@ class TestAnalyzeEndpoint:
 class TestAnalysesEndpoints:
     """Тесты для endpoints списка анализов"""
     
-    def test_get_analyses_list(self):
+    def test_get_analyses_list(self, test_client):
         """Тест получения списка анализов"""
-        response = client.get("/api/v1/analyses")
+        response = test_client.get("/api/v1/analyses")
         
         assert response.status_code == 200
         data = response.json()
         
         assert "total" in data
+        assert data["estimated"] is False
         assert "items" in data
         assert isinstance(data["items"], list)
     
-    def test_get_analyses_with_pagination(self):
+    def test_get_analyses_with_pagination(self, test_client):
         """Тест пагинации списка анализов"""
-        response = client.get("/api/v1/analyses?skip=0&limit=10")
+        response = test_client.get("/api/v1/analyses?skip=0&limit=10")
         
         assert response.status_code == 200
         data = response.json()
         
         assert len(data["items"]) <= 10
     
-    def test_get_analysis_by_id_not_found(self):
+    def test_get_analysis_by_id_not_found(self, test_client):
         """Тест получения несуществующего анализа"""
-        response = client.get("/api/v1/analyses/999999")
+        response = test_client.get("/api/v1/analyses/999999")
         
         assert response.status_code == 404
         data = response.json()
@@ -135,9 +131,9 @@ class TestAnalysesEndpoints:
 class TestMetricsEndpoint:
     """Тесты для GET /api/v1/metrics endpoint"""
     
-    def test_metrics_endpoint(self):
+    def test_metrics_endpoint(self, session_client):
         """Тест получения Prometheus метрик"""
-        response = client.get("/api/v1/metrics")
+        response = session_client.get("/api/v1/metrics")
         
         assert response.status_code == 200
         assert "text/plain" in response.headers["content-type"]
@@ -150,9 +146,9 @@ class TestMetricsEndpoint:
         assert "videos_processing_errors_total" in content
         assert "videos_motion_detected_total" in content
     
-    def test_metrics_format(self):
+    def test_metrics_format(self, session_client):
         """Тест формата Prometheus метрик"""
-        response = client.get("/api/v1/metrics")
+        response = session_client.get("/api/v1/metrics")
         
         content = response.text
         lines = content.split("\n")
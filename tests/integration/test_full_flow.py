@@ -2,13 +2,8 @@
 E2E тесты полного цикла обработки видео
 """
 import pytest
-from fastapi.testclient import TestClient
 from pathlib import Path
 
-from src.main import app
-
-client = TestClient(app)
-
 
 @pytest.mark.skipif(
     not Path("tests/fixtures/motion_video.mp4").exists(),
@@ -17,7 +12,7 @@ client = TestClient(app)
 class TestFullVideoAnalysisFlow:
     """Тесты полного цикла анализа видео"""
     
-    def test_complete_analysis_flow(self):
+    def test_complete_analysis_flow(self, test_client):
         """
         Тест полного цикла: загрузка → анализ → сохранение → получение
         """
@@ -26,14 +21,14 @@ class TestFullVideoAnalysisFlow:
         # 1. Загрузка и анализ видео
         with open(video_path, "rb") as f:
             files = {"file": ("motion_video.mp4", f, "video/mp4")}
-            analyze_response = client.post("/api/v1/analyze", files=files)
+            analyze_response = test_client.post("/api/v1/analyze", files=files)
         
         assert analyze_response.status_code == 200
         analysis_data = analyze_response.json()
         analysis_id = analysis_data["id"]
         
         # 2. Получение конкретного анализа по ID
-        get_response = client.get(f"/api/v1/analyses/{analysis_id}")
+        get_response = test_client.get(f"/api/v1/analyses/{analysis_id}")
         
         assert get_response.status_code == 200
         retrieved_data = get_response.json()
@@ -43,7 +38,7 @@ class TestFullVideoAnalysisFlow:
         assert retrieved_data["motion_detected"] == analysis_data["motion_detected"]
         
         # 3. Проверка что анализ присутствует в списке
-        list_response = client.get("/api/v1/analyses")
+        list_response = test_client.get("/api/v1/analyses")
         
         assert list_response.status_code == 200
         list_data = list_response.json()
@@ -53,7 +48,7 @@ class TestFullVideoAnalysisFlow:
         assert found, f"Analysis {analysis_id} not found in list"
         
         # 4. Проверка обновления метрик
-        metrics_response = client.get("/api/v1/metrics")
+        metrics_response = test_client.get("/api/v1/metrics")
         
         assert metrics_response.status_code == 200
         metrics_content = metrics_response.text
@@ -61,7 +56,7 @@ class TestFullVideoAnalysisFlow:
         # Метрики должны быть обновлены
         assert "videos_processed_total" in metrics_content
     
-    def test_multiple_videos_analysis(self):
+    def test_multiple_videos_analysis(self, test_client):
         """Тест анализа нескольких видео подряд"""
         video_paths = [
             Path("tests/fixtures/static_video.mp4"),
@@ -76,7 +71,7 @@ class TestFullVideoAnalysisFlow:
             
             with open(video_path, "rb") as f:
                 files = {"file": (video_path.name, f, "video/mp4")}
-                response = client.post("/api/v1/analyze", files=files)
+                response = test_client.post("/api/v1/analyze", files=files)
             
             assert response.status_code == 200
             data = response.json()
@@ -90,6 +85,6 @@ class TestFullVideoAnalysisFlow:
         
         # Проверяем что все анализы можно получить
         for analysis_id in analysis_ids:
-            response = client.get(f"/api/v1/analyses/{analysis_id}")
+            response = test_client.get(f"/api/v1/analyses/{analysis_id}")
             assert response.status_code == 200
 
@@ -0,0 +1,24 @@
+"""
+Тесты для настройки подключения к БД
+"""
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+
+from src.db.database import check_db_connection
+
+
+def test_check_db_connection_success():
+    """Тест проверки подключения к доступной БД"""
+    engine = create_engine("sqlite:///:memory:")
+
+    with patch("src.db.database.engine", engine):
+        assert check_db_connection() is True
+
+
+def test_check_db_connection_failure():
+    """Тест проверки подключения к недоступной БД"""
+    engine = create_engine("sqlite:////nonexistent/dir/visionguard.db")
+
+    with patch("src.db.database.engine", engine):
+        assert check_db_connection() is False
@@ -0,0 +1,207 @@
+"""
+Тесты для утилит работы с файлами
+"""
+import errno
+import io
+import os
+import tempfile
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.utils.exceptions import VideoTooLargeError
+from src.utils.file_utils import (
+    _copy_with_limit,
+    cleanup_old_files,
+    create_temp_file,
+    get_file_size_mb,
+    save_upload_file,
+)
+
+
+@pytest.fixture
+def upload_dir(tmp_path):
+    """Fixture для временной директории загрузок"""
+    with patch("src.utils.file_utils.settings.UPLOAD_DIR", str(tmp_path)):
+        yield tmp_path
+
+
+class TestSaveUploadFile:
+    """Тесты для save_upload_file"""
+
+    def test_save_upload_file(self, upload_dir):
+        """Тест сохранения загруженного файла"""
+        content = b"video content" * 1000
+
+        file_path = save_upload_file(io.BytesIO(content), "video.mp4")
+
+        assert file_path.parent == upload_dir
+        assert file_path.name.endswith("_video.mp4")
+        assert file_path.read_bytes() == content
+
+    def test_save_upload_file_unique_names(self, upload_dir):
+        """Тест уникальности имен при одновременной загрузке одноименных файлов"""
+        paths = {save_upload_file(io.BytesIO(b"data"), "video.mp4") for _ in range(10)}
+
+        assert len(paths) == 10
+
+    def test_save_upload_file_too_large(self, upload_dir):
+        """Тест прерывания сохранения слишком большого файла"""
+        content = b"0" * (2 * 1024 * 1024)
+
+        with pytest.raises(VideoTooLargeError) as exc_info:
+            save_upload_file(io.BytesIO(content), "video.mp4", max_size_mb=1)
+
+        assert exc_info.value.max_size_mb == 1
+        # Частично записанный файл удален
+        assert list(upload_dir.iterdir()) == []
+
+    def test_save_upload_file_from_disk(self, upload_dir, tmp_path_factory):
+        """Тест сохранения файла с диска (копирование средствами ядра)"""
+        source_path = tmp_path_factory.mktemp("source") / "upload.bin"
+        source_path.write_bytes(b"header" + b"video content" * 1000)
+
+        with open(source_path, "rb") as source:
+            source.seek(6)  # Копируется от текущей позиции
+            with patch("src.utils.file_utils._copy_with_limit") as buffered_copy:
+                file_path = save_upload_file(source, "video.mp4")
+
+        buffered_copy.assert_not_called()
+        assert file_path.read_bytes() == b"video content" * 1000
+
+    def test_save_upload_file_from_disk_too_large(self, upload_dir, tmp_path_factory):
+        """Тест отказа до копирования слишком большого файла с диска"""
+        source_path = tmp_path_factory.mktemp("source") / "upload.bin"
+        source_path.write_bytes(b"0" * (2 * 1024 * 1024))
+
+        with open(source_path, "rb") as source:
+            with pytest.raises(VideoTooLargeError):
+                save_upload_file(source, "video.mp4", max_size_mb=1)
+
+        assert list(upload_dir.iterdir()) == []
+
+    def test_save_upload_file_kernel_copy_fallback(self, upload_dir, tmp_path_factory):
+        """Тест перехода на копирование по частям, если ядро не поддерживает копирование"""
+        source_path = tmp_path_factory.mktemp("source") / "upload.bin"
+        source_path.write_bytes(b"video content" * 1000)
+        unsupported = OSError(errno.EXDEV, "Invalid cross-device link")
+
+        with open(source_path, "rb") as source:
+            with patch("os.copy_file_range", side_effect=unsupported, create=True):
+                file_path = save_upload_file(source, "video.mp4")
+
+        assert file_path.read_bytes() == b"video content" * 1000
+
+
+    def test_save_upload_file_in_memory_spool(self, upload_dir):
+        """Тест: содержимое SpooledTemporaryFile в памяти сохраняется полностью"""
+        content = b"video content" * 100
+
+        with tempfile.SpooledTemporaryFile(max_size=1024 * 1024) as source:
+            source.write(content)
+            source.seek(0)
+            file_path = save_upload_file(source, "video.mp4")
+
+        assert file_path.read_bytes() == content
+
+    def test_save_upload_file_without_copy_file_range(self, upload_dir, monkeypatch):
+        """Тест: без copy_file_range (macOS/BSD) используется копирование по частям"""
+        content = b"video content" * 100
+        monkeypatch.delattr(os, "copy_file_range", raising=False)
+
+        with tempfile.TemporaryFile() as source:
+            source.write(content)
+            source.seek(0)
+            with patch("src.utils.file_utils._copy_with_limit", wraps=_copy_with_limit) as chunked:
+                file_path = save_upload_file(source, "video.mp4")
+
+        chunked.assert_called_once()
+        assert file_path.read_bytes() == content
+
+    def test_save_upload_file_from_pipe(self, upload_dir):
+        """Тест: для pipe (размер неизвестен) используется копирование по частям"""
+        content = b"video content" * 100
+        read_fd, write_fd = os.pipe()
+        os.write(write_fd, content)
+        os.close(write_fd)
+
+        with os.fdopen(read_fd, "rb") as source:
+            file_path = save_upload_file(source, "video.mp4")
+
+        assert file_path.read_bytes() == content
+
+
+class TestCleanupOldFiles:
+    """Тесты для cleanup_old_files"""
+
+    def test_cleanup_old_files(self, upload_dir):
+        """Тест удаления только устаревших файлов"""
+        old_file = upload_dir / "old.mp4"
+        new_file = upload_dir / "new.mp4"
+        old_file.write_bytes(b"old")
+        new_file.write_bytes(b"new")
+        (upload_dir / "subdir").mkdir()
+
+        old_time = time.time() - 48 * 3600
+        os.utime(old_file, (old_time, old_time))
+
+        assert cleanup_old_files(max_age_hours=24) == 1
+        assert sorted(p.name for p in upload_dir.iterdir()) == ["new.mp4", "subdir"]
+
+    def test_cleanup_old_files_unlink_error(self, upload_dir):
+        """Тест подсчета только успешно удаленных файлов"""
+        old_time = time.time() - 48 * 3600
+        for name in ("a.mp4", "b.mp4"):
+            path = upload_dir / name
+            path.write_bytes(b"old")
+            os.utime(path, (old_time, old_time))
+
+        real_unlink = os.unlink
+
+        def unlink(path):
+            if path.endswith("a.mp4"):
+                raise PermissionError("denied")
+            real_unlink(path)
+
+        with patch("src.utils.file_utils.os.unlink", side_effect=unlink):
+            assert cleanup_old_files(max_age_hours=24) == 1
+
+        assert [p.name for p in upload_dir.iterdir()] == ["a.mp4"]
+
+    def test_cleanup_old_files_missing_dir(self, tmp_path):
+        """Тест очистки несуществующей директории"""
+        with patch("src.utils.file_utils.settings.UPLOAD_DIR", str(tmp_path / "missing")):
+            assert cleanup_old_files() == 0
+
+
+def test_get_file_size_mb(tmp_path):
+    """Тест размера файла в МБ, в том числе по готовому stat"""
+    file_path = tmp_path / "video.mp4"
+    file_path.write_bytes(b"0" * (1024 * 1024 + 512 * 1024))
+
+    assert get_file_size_mb(file_path) == 1.5
+    assert get_file_size_mb(file_path, os.stat(file_path)) == 1.5
+
+
+def test_create_temp_file(upload_dir):
+    """Тест создания пустого временного файла с уникальным именем"""
+    first = create_temp_file()
+    second = create_temp_file(suffix=".avi")
+
+    assert first != second
+    assert first.parent == upload_dir
+    assert first.suffix == ".mp4" and second.suffix == ".avi"
+    assert first.stat().st_size == 0
+    assert first.stat().st_mode & 0o777 == 0o600
+
+
+def test_create_temp_file_name_taken(upload_dir):
+    """Тест перехода на mkstemp, если имя уже занято"""
+    with patch("src.utils.file_utils._upload_counter", iter([7, 7])):
+        taken = create_temp_file()
+        path = create_temp_file()
+
+    assert path != taken
+    assert path.exists()
+    assert path.parent == upload_dir
@@ -0,0 +1,101 @@
+"""
+Тесты для настройки логирования
+"""
+import io
+import logging
+
+import orjson
+import pytest
+
+from src.utils import logging_utils
+from src.utils.logging_utils import JSONFormatter, setup_logging
+
+
+def _make_record(msg, *args, **extra):
+    """Создание записи лога с полями extra"""
+    record = logging.LogRecord("src.test", logging.INFO, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter():
+    """Тест JSON форматирования записи"""
+    record = _make_record("GET %s", "/health")
+
+    entry = orjson.loads(JSONFormatter().format(record))
+
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "src.test"
+    assert entry["message"] == "GET /health"
+    assert "timestamp" in entry
+
+
+def test_json_formatter_extra_fields():
+    """Тест: поля extra попадают в JSON"""
+    record = _make_record("request", method="GET", status_code=200, duration_ms=1.5)
+
+    entry = orjson.loads(JSONFormatter().format(record))
+
+    assert entry["method"] == "GET"
+    assert entry["status_code"] == 200
+    assert entry["duration_ms"] == 1.5
+    assert "args" not in entry
+
+
+@pytest.fixture
+def json_logging():
+    """Fixture: JSON логирование через очередь с перехватом вывода listener'а"""
+    root_logger = logging.getLogger()
+    level = root_logger.level
+    stream = io.StringIO()
+
+    listener = setup_logging("INFO", "json")
+    listener.handlers[0].setStream(stream)
+    try:
+        yield listener, stream
+    finally:
+        root_logger.removeHandler(logging_utils._queue_handler)
+        logging_utils._stop_listener()
+        logging_utils._queue_handler = None
+        root_logger.setLevel(level)
+
+
+def test_setup_logging_exception_through_queue(json_logging):
+    """Тест: traceback проходит через очередь в отдельное поле JSON"""
+    listener, stream = json_logging
+
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logging.getLogger("src.test").exception("Failed %s", "upload", extra={"file_id": 7})
+    listener.stop()
+    listener.start()
+
+    entry = orjson.loads(stream.getvalue().splitlines()[-1])
+
+    assert entry["message"] == "Failed upload"
+    assert entry["file_id"] == 7
+    assert "ValueError: boom" in entry["exception"]
+    assert "Traceback" not in entry["message"]
+
+
+def test_setup_logging_idempotent(json_logging):
+    """Тест: повторная настройка заменяет только свой обработчик"""
+    root_logger = logging.getLogger()
+    foreign_handler = logging.NullHandler()
+    root_logger.addHandler(foreign_handler)
+
+    try:
+        first_listener, _ = json_logging
+        second_listener = setup_logging("INFO", "text")
+
+        queue_handlers = [
+            h for h in root_logger.handlers
+            if isinstance(h, logging_utils._RecordQueueHandler)
+        ]
+        assert queue_handlers == [logging_utils._queue_handler]
+        assert foreign_handler in root_logger.handlers
+        assert first_listener._thread is None
+        assert second_listener._thread is not None
+    finally:
+        root_logger.removeHandler(foreign_handler)
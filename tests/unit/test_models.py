@@ -63,4 +63,5 @@ def test_video_analysis_to_dict():
     assert result["frames_analyzed"] == 75
     assert result["processing_time"] == 1.5
     assert result["status"] == "completed"
+    assert result["created_at"] == now
 
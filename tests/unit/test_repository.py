@@ -0,0 +1,242 @@
+"""
+Тесты для VideoAnalysisRepository
+"""
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from sqlalchemy import event
+
+from src.db.repository import VideoAnalysisRepository
+
+
+@pytest.fixture
+def repo(test_db):
+    """Fixture для репозитория на тестовой БД"""
+    return VideoAnalysisRepository(test_db)
+
+
+def _create_analysis(
+    repo,
+    filename="video.mp4",
+    motion_detected=False,
+    status="completed",
+    created_at=None
+):
+    """Создание записи анализа с типовыми значениями"""
+    analysis = repo.create(
+        filename=filename,
+        motion_detected=motion_detected,
+        frames_analyzed=10,
+        processing_time=0.5,
+        status=status
+    )
+
+    if created_at is not None:
+        analysis.created_at = created_at
+        repo.db.commit()
+
+    return analysis
+
+
+class TestCountTotal:
+    """Тесты подсчета записей"""
+
+    def test_count_total_empty(self, repo):
+        """Тест подсчета в пустой таблице"""
+        assert repo.count_total() == 0
+
+    def test_count_total(self, repo):
+        """Тест подсчета всех записей"""
+        _create_analysis(repo, status="completed")
+        _create_analysis(repo, status="failed")
+
+        assert repo.count_total() == 2
+
+    def test_count_total_with_status(self, repo):
+        """Тест подсчета с фильтром по статусу"""
+        _create_analysis(repo, status="completed")
+        _create_analysis(repo, status="completed")
+        _create_analysis(repo, status="failed")
+
+        assert repo.count_total(status="completed") == 2
+        assert repo.count_total(status="failed") == 1
+        assert repo.count_total(status="pending") == 0
+
+
+class TestCountTotalEstimated:
+    """Тесты подсчета с признаком оценки"""
+
+    def test_count_total_estimated_small_table(self, repo):
+        """Тест точного подсчета, если оценка недоступна"""
+        _create_analysis(repo)
+
+        assert repo.count_total_estimated() == (1, False)
+
+    def test_count_total_estimated_large_table(self, repo):
+        """Тест оценки для большой таблицы без фильтра"""
+        with patch.object(repo, "_estimate_total", return_value=250_000):
+            assert repo.count_total_estimated() == (250_000, True)
+
+    def test_count_total_stays_exact(self, repo):
+        """Тест: count_total не использует оценку по статистике"""
+        _create_analysis(repo)
+
+        with patch.object(repo, "_estimate_total", return_value=250_000) as estimate:
+            assert repo.count_total() == 1
+
+        estimate.assert_not_called()
+
+    def test_count_total_estimated_with_status(self, repo):
+        """Тест: с фильтром по статусу подсчет всегда точный"""
+        _create_analysis(repo, status="completed")
+        _create_analysis(repo, status="failed")
+
+        with patch.object(repo, "_estimate_total", return_value=250_000):
+            assert repo.count_total_estimated(status="failed") == (1, False)
+
+
+class TestGetAll:
+    """Тесты получения списка записей"""
+
+    def test_get_all_ordered_newest_first(self, repo):
+        """Тест сортировки: новые записи первыми"""
+        ids = [_create_analysis(repo, filename=f"video_{i}.mp4").id for i in range(3)]
+
+        items = repo.get_all()
+
+        assert [item.id for item in items] == sorted(ids, reverse=True)
+
+    def test_get_all_with_cursor(self, repo):
+        """Тест keyset пагинации по курсору (created_at, id)"""
+        start = datetime(2025, 1, 1, 12, 0, 0)
+        # Записи 2 и 3 созданы одновременно - порядок между ними задает id
+        offsets = [0, 1, 1, 2, 3]
+        for i, offset in enumerate(offsets):
+            _create_analysis(
+                repo,
+                filename=f"video_{i}.mp4",
+                created_at=start + timedelta(seconds=offset)
+            )
+
+        first_page = repo.get_all(limit=2)
+        last = first_page[-1]
+        second_page = repo.get_all(limit=2, after=(last.created_at, last.id))
+        last = second_page[-1]
+        third_page = repo.get_all(limit=2, after=(last.created_at, last.id))
+
+        pages = first_page + second_page + third_page
+        assert [item.id for item in pages] == [5, 4, 3, 2, 1]
+
+    def test_get_all_with_cursor_and_status(self, repo):
+        """Тест курсора вместе с фильтром по статусу"""
+        start = datetime(2025, 1, 1, 12, 0, 0)
+        for i, status in enumerate(("completed", "failed", "completed", "failed")):
+            _create_analysis(repo, status=status, created_at=start + timedelta(seconds=i))
+
+        first_page = repo.get_all(limit=1, status="completed")
+        last = first_page[-1]
+        second_page = repo.get_all(limit=1, status="completed", after=(last.created_at, last.id))
+
+        assert [item.id for item in first_page + second_page] == [3, 1]
+
+
+class TestCreateMany:
+    """Тесты пакетного создания записей"""
+
+    def test_create_many(self, repo):
+        """Тест пакетной вставки с возвратом ID в порядке записей"""
+        records = [
+            {
+                "filename": f"video_{i}.mp4",
+                "motion_detected": i % 2 == 0,
+                "frames_analyzed": 10 + i,
+                "processing_time": 0.5,
+                "status": "completed",
+            }
+            for i in range(3)
+        ]
+
+        ids = repo.create_many(records)
+
+        assert len(ids) == 3
+        assert [repo.get_by_id(i).filename for i in ids] == [r["filename"] for r in records]
+        assert repo.get_by_id(ids[0]).created_at is not None
+
+    def test_create_many_empty(self, repo):
+        """Тест пакетной вставки пустого списка"""
+        assert repo.create_many([]) == []
+        assert repo.count_total() == 0
+
+
+class TestUpdateAndDelete:
+    """Тесты обновления статуса и удаления"""
+
+    def test_update_status(self, repo):
+        """Тест обновления статуса одним запросом"""
+        analysis = _create_analysis(repo, status="processing")
+
+        updated = repo.update_status(analysis.id, "failed", error_message="boom")
+
+        assert updated.id == analysis.id
+        assert updated.status == "failed"
+        assert updated.error_message == "boom"
+        assert repo.get_by_id(analysis.id).status == "failed"
+
+    def test_update_status_single_statement(self, repo):
+        """Тест: обновление и чтение атрибутов результата - один запрос"""
+        analysis = _create_analysis(repo, status="processing")
+        analysis_id = analysis.id
+        statements = []
+
+        def count_statement(conn, cursor, statement, parameters, context, executemany):
+            if not statement.startswith(("SAVEPOINT", "RELEASE", "ROLLBACK")):
+                statements.append(statement)
+
+        connection = repo.db.connection()
+        event.listen(connection, "after_cursor_execute", count_statement)
+        try:
+            updated = repo.update_status(analysis_id, "failed", error_message="boom")
+            values = (updated.status, updated.error_message, updated.filename, updated.created_at)
+        finally:
+            event.remove(connection, "after_cursor_execute", count_statement)
+
+        assert values[:3] == ("failed", "boom", "video.mp4")
+        assert values[3] is not None
+        assert len(statements) == 1
+        assert statements[0].startswith("UPDATE")
+
+    def test_update_status_not_found(self, repo):
+        """Тест обновления несуществующей записи"""
+        assert repo.update_status(999, "failed") is None
+
+    def test_delete(self, repo):
+        """Тест удаления записи"""
+        analysis = _create_analysis(repo)
+
+        assert repo.delete(analysis.id) is True
+        assert repo.get_by_id(analysis.id) is None
+        assert repo.delete(analysis.id) is False
+
+
+class TestStats:
+    """Тесты сводной статистики"""
+
+    def test_stats(self, repo):
+        """Тест подсчета всей статистики одним запросом"""
+        _create_analysis(repo, motion_detected=True, status="completed")
+        _create_analysis(repo, motion_detected=False, status="completed")
+        _create_analysis(repo, motion_detected=True, status="failed")
+
+        stats = repo.stats()
+
+        assert stats == {
+            "total": 3,
+            "with_motion": 2,
+            "by_status": {"completed": 2, "failed": 1},
+        }
+        assert stats["total"] == repo.count_total()
+        assert stats["with_motion"] == repo.count_with_motion()
+
+    def test_stats_empty(self, repo):
+        """Тест статистики пустой таблицы"""
+        assert repo.stats() == {"total": 0, "with_motion": 0, "by_status": {}}
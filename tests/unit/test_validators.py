@@ -4,6 +4,7 @@
 import pytest
 from pathlib import Path
 import tempfile
+from unittest.mock import MagicMock, patch
 
 from src.utils.validators import VideoValidator
 from src.utils.exceptions import (
@@ -63,6 +64,7 @@ class TestVideoValidator:
             validator.validate_file_extension(invalid_path)
         
         assert ".txt" in str(exc_info.value)
+        assert exc_info.value.supported_formats == ['.avi', '.mkv', '.mov', '.mp4']
     
     def test_validate_file_size_success(self):
         """Тест проверки размера - успех"""
@@ -96,3 +98,87 @@ class TestVideoValidator:
         finally:
             temp_path.unlink()
 
+    
+    @pytest.mark.parametrize("header, expected", [
+        (b"\x00\x00\x00\x20ftypisom\x00\x00\x02\x00", "video/mp4"),
+        (b"\x00\x00\x00\x14ftypqt  \x00\x00\x00\x00", "video/quicktime"),
+        (b"\x00\x00\x00\x08wide\x00\x00\x00\x00\x00\x00", "video/quicktime"),
+        (b"\x00\x00\x00\x08wide\x00\x00\x00\x10mdat" + b"\x00" * 8, "video/quicktime"),
+        # ftyp после ведущих боксов free/skip
+        (b"\x00\x00\x00\x10free" + b"\x00" * 8 + b"\x00\x00\x00\x10ftypisom\x00\x00\x02\x00",
+         "video/mp4"),
+        (b"\x00\x00\x00\x0cskip\x00\x00\x00\x00\x00\x00\x00\x14ftypqt  \x00\x00\x00\x00",
+         "video/quicktime"),
+        # 64-битный размер ведущего бокса
+        (b"\x00\x00\x00\x01free" + (24).to_bytes(8, "big") + b"\x00" * 8
+         + b"\x00\x00\x00\x10ftypmp42\x00\x00\x00\x00", "video/mp4"),
+        # Без ftyp в пределах заголовка: moov/mdat первыми
+        (b"\x00\x00\x00\x10moov" + b"\x00" * 8, "video/mp4"),
+        (b"\x00\x10\x00\x00mdat" + b"\x00" * 8, "video/mp4"),
+        # Фрагментированный/сегментированный MP4
+        (b"\x00\x00\x00\x18stypmsdh\x00\x00\x00\x00", "video/mp4"),
+        (b"\x00\x00\x00\x10moof\x00\x00\x00\x10mfhd", "video/mp4"),
+        (b"\x00\x00\x00\x20uuid" + b"\x00" * 8, "video/mp4"),
+        (b"RIFF\x00\x10\x00\x00AVI LIST", "video/x-msvideo"),
+        (b"\x1a\x45\xdf\xa3\x9f\x42\x86\x81\x01\x42\xf7\x81", "video/x-matroska"),
+        (b"0" * 16, None),
+        (b"\x00\x00\x00\x08abcd" + b"\x00" * 8, None),
+        # Ведущий бокс, за которым нет известных боксов
+        (b"\x00\x00\x00\x08free\x00\x00\x00\x08abcd", "video/mp4"),
+    ])
+    def test_detect_container(self, header, expected):
+        """Тест определения контейнера по сигнатуре"""
+        assert VideoValidator.detect_container(header) == expected
+    
+    def test_validate_mime_type_fragmented_mp4(self, tmp_path):
+        """Тест проверки MIME типа сегмента фрагментированного MP4"""
+        segment = tmp_path / "segment.mp4"
+        segment.write_bytes(b"\x00\x00\x00\x18stypmsdh\x00\x00\x00\x00" + b"\x00" * 64)
+        
+        VideoValidator().validate_mime_type(segment)  # Не должно выбросить исключение
+    
+    def test_validate_mime_type_unknown_signature(self):
+        """Тест проверки MIME типа файла с неизвестной сигнатурой"""
+        validator = VideoValidator()
+        
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".mp4") as f:
+            f.write(b"not a video file at all")
+            temp_path = Path(f.name)
+        
+        try:
+            with pytest.raises(UnsupportedFormatError):
+                validator.validate_mime_type(temp_path)
+        finally:
+            temp_path.unlink()
+    
+    @pytest.mark.skipif(
+        not Path("tests/fixtures/motion_video.mp4").exists(),
+        reason="Test video not found. Run: python scripts/generate_test_video.py"
+    )
+    def test_validate_mime_type_success(self):
+        """Тест проверки MIME типа настоящего видео"""
+        VideoValidator().validate_mime_type(Path("tests/fixtures/motion_video.mp4"))
+    
+    @pytest.mark.skipif(
+        not Path("tests/fixtures/motion_video.mp4").exists(),
+        reason="Test video not found. Run: python scripts/generate_test_video.py"
+    )
+    def test_validate_mime_type_deep_check(self):
+        """Тест дополнительной проверки через libmagic"""
+        detector = MagicMock()
+        detector.from_buffer.return_value = "text/plain"
+        
+        with patch("src.utils.validators.settings.VIDEO_DEEP_MIME_CHECK", True), \
+                patch("src.utils.validators._get_magic", return_value=detector):
+            with pytest.raises(UnsupportedFormatError):
+                VideoValidator().validate_mime_type(Path("tests/fixtures/motion_video.mp4"))
+        
+        header = detector.from_buffer.call_args.args[0]
+        assert len(header) > 16
+    
+    def test_validate_file_exists_directory(self, tmp_path):
+        """Тест проверки существования - путь является директорией"""
+        validator = VideoValidator()
+        
+        with pytest.raises(InvalidVideoError, match="not a file"):
+            validator.validate_file_exists(tmp_path)
@@ -27,6 +27,7 @@ class TestVideoAnalysisResult:
         assert result.motion_detected is True
         assert result.frames_analyzed == 100
         assert result.processing_time == 2.5
+        assert not hasattr(result, "__dict__")
     
     def test_result_to_dict(self):
         """Тест преобразования результата в словарь"""
@@ -84,8 +85,8 @@ class TestVideoAnalyzer:
         
         processed = analyzer._preprocess_frame(frame)
         
-        # Проверяем размер
-        assert processed.shape == (240, 320)
+        # Проверяем размер (после pyrDown - вдвое меньше processing размера)
+        assert processed.shape == (120, 160)
         # Проверяем что это grayscale (2D массив)
         assert len(processed.shape) == 2
     
@@ -116,6 +117,37 @@ class TestVideoAnalyzer:
         assert motion_detected is False
         assert intensity >= 0
     
+    def test_detect_motion_batch_matches_pairwise(self):
+        """Тест: пакетная детекция совпадает с попарной"""
+        analyzer = VideoAnalyzer(motion_threshold=0.01)
+        
+        frames = np.zeros((4, 240, 320), dtype=np.uint8)
+        frames[1, 100:140, 150:190] = 255
+        frames[3, 0:10, 0:10] = 255  # Изменение у границы кадра
+        
+        change_ratios, intensities = analyzer._detect_motion_batch(frames)
+        
+        assert change_ratios.shape == intensities.shape == (3,)
+        for i in range(3):
+            motion_detected, intensity = analyzer._detect_motion(frames[i], frames[i + 1])
+            assert motion_detected == (change_ratios[i] > analyzer.motion_threshold)
+            assert intensity == pytest.approx(intensities[i])
+        # Пары без изменений не получают движения соседних кадров
+        assert change_ratios[2] > 0
+        assert change_ratios[1] > change_ratios[2]
+    
+    def test_process_video_reader_error(self):
+        """Тест: ошибка в потоке чтения кадров пробрасывается наружу"""
+        analyzer = VideoAnalyzer(frame_sample_rate=1)
+        
+        cap = Mock()
+        cap.get.return_value = 0
+        cap.read.return_value = (True, np.zeros((480, 640, 3), dtype=np.uint8))
+        
+        with patch.object(analyzer, "_preprocess_frame", side_effect=RuntimeError("decode")):
+            with pytest.raises(RuntimeError, match="decode"):
+                analyzer._process_video(cap)
+    
     def test_analyze_invalid_video_path(self):
         """Тест анализа несуществующего видео"""
         analyzer = VideoAnalyzer()
@@ -157,3 +189,70 @@ class TestVideoAnalyzer:
         assert result.processing_time > 0
         assert result.motion_percentage > 10.0
 
+    
+    @pytest.mark.skipif(
+        not Path("tests/fixtures/motion_video.mp4").exists(),
+        reason="Test video not found. Run: python scripts/generate_test_video.py"
+    )
+    def test_analyze_hw_acceleration_fallback(self):
+        """Тест: результат не зависит от запроса аппаратного декодирования"""
+        video_path = Path("tests/fixtures/motion_video.mp4")
+        
+        hw_result = VideoAnalyzer(hw_acceleration=True).analyze(video_path)
+        sw_result = VideoAnalyzer(hw_acceleration=False).analyze(video_path)
+        
+        assert hw_result.frames_analyzed == sw_result.frames_analyzed
+        assert hw_result.motion_detected == sw_result.motion_detected
+    
+    @pytest.mark.skipif(
+        not Path("tests/fixtures/motion_video.mp4").exists(),
+        reason="Test video not found. Run: python scripts/generate_test_video.py"
+    )
+    def test_analyze_segments_match_sequential(self):
+        """Тест: анализ по сегментам в процессах совпадает с последовательным"""
+        video_path = Path("tests/fixtures/motion_video.mp4")
+        
+        sequential = VideoAnalyzer(frame_sample_rate=3).analyze(video_path)
+        
+        with patch("src.services.video_analyzer.settings.PARALLEL_ANALYSIS_MIN_FRAMES", 1):
+            segmented = VideoAnalyzer(frame_sample_rate=3, workers=2).analyze(video_path)
+        
+        assert segmented.frames_analyzed == sequential.frames_analyzed
+        assert segmented.total_frames == sequential.total_frames
+        assert segmented.motion_percentage == pytest.approx(sequential.motion_percentage)
+        assert segmented.avg_motion_intensity == pytest.approx(sequential.avg_motion_intensity)
+    
+    @pytest.mark.skipif(
+        not Path("tests/fixtures/motion_video.mp4").exists(),
+        reason="Test video not found. Run: python scripts/generate_test_video.py"
+    )
+    def test_analyze_early_exit(self):
+        """Тест: досрочное завершение не меняет вывод о движении"""
+        video_path = Path("tests/fixtures/motion_video.mp4")
+        
+        full = VideoAnalyzer().analyze(video_path)
+        
+        with patch("src.services.video_analyzer.settings.MOTION_EARLY_EXIT", True):
+            early = VideoAnalyzer().analyze(video_path)
+        
+        assert early.motion_detected is full.motion_detected is True
+        assert early.frames_analyzed < full.frames_analyzed
+        assert early.motion_percentage > 10.0
+    
+    @pytest.mark.skipif(
+        not Path("tests/fixtures/motion_video.mp4").exists(),
+        reason="Test video not found. Run: python scripts/generate_test_video.py"
+    )
+    def test_analyze_with_details(self):
+        """Тест анализа с информацией о видео за одно открытие файла"""
+        analyzer = VideoAnalyzer()
+        video_path = Path("tests/fixtures/motion_video.mp4")
+        
+        with patch.object(analyzer, "_open_capture", wraps=analyzer._open_capture) as open_capture:
+            details = analyzer.analyze_with_details(video_path)
+        
+        open_capture.assert_called_once()
+        assert details["motion_detected"] is True
+        assert details["video_info"]["fps"] > 0
+        assert details["video_info"]["duration_seconds"] > 0
+        assert details["video_info"]["resolution"] == "640x480"